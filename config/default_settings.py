@@ -1,86 +1,167 @@
-"""Configurare implicita pentru CopySpell AI"""
-import os
-from pathlib import Path
-from typing import Optional
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-
-class DefaultSettings(BaseSettings):
-    """Configurari implicite - fara API keys sensibile"""
-    
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore"
-    )
-    
-    # API Keys - vor fi completate de utilizator
-    deepseek_api_key: Optional[str] = Field(default=None, alias="DEEPSEEK_API_KEY")
-    groq_api_key: Optional[str] = Field(default=None, alias="GROQ_API_KEY")
-    openrouter_api_key: Optional[str] = Field(default=None, alias="OPENROUTER_API_KEY")
-    
-    # App Settings
-    app_name: str = "CopySpell AI"
-    app_version: str = "1.0.0"
-    debug: bool = Field(default=False, alias="DEBUG")
-    
-    # Rate Limiting
-    max_retries: int = 3
-    retry_delay: float = 1.0
-    timeout: int = 60
-    
-    # Provider Priority (order of fallback)
-    provider_priority: list[str] = Field(default=["groq", "deepseek", "openrouter"])
-    
-    @property
-    def config_dir(self) -> Path:
-        """Get configuration directory."""
-        config_path = Path.home() / ".copyspell-ai"
-        config_path.mkdir(exist_ok=True)
-        return config_path
-
-    @property
-    def history_file(self) -> Path:
-        """Get history file path."""
-        return self.config_dir / "history.json"
-
-    def save_api_keys(self):
-        """Save API keys to .env file."""
-        env_path = Path(".env")
-        env_content = []
-        
-        if env_path.exists():
-            env_content = env_path.read_text().splitlines()
-        
-        # Update or add API keys
-        keys_to_save = {
-            "DEEPSEEK_API_KEY": self.deepseek_api_key or "",
-            "GROQ_API_KEY": self.groq_api_key or "",
-            "OPENROUTER_API_KEY": self.openrouter_api_key or ""
-        }
-        
-        existing_keys = set()
-        for i, line in enumerate(env_content):
-            for key in keys_to_save:
-                if line.startswith(f"{key}="):
-                    env_content[i] = f"{key}={keys_to_save[key]}"
-                    existing_keys.add(key)
-        
-        for key, value in keys_to_save.items():
-            if key not in existing_keys:
-                env_content.append(f"{key}={value}")
-        
-        env_path.write_text("\n".join(env_content))
-
-    def has_any_api_key(self) -> bool:
-        """Check if at least one API key is configured."""
-        return any([
-            self.deepseek_api_key,
-            self.groq_api_key,
-            self.openrouter_api_key
-        ])
-
-
-# Global settings instance
-default_settings = DefaultSettings()
\ No newline at end of file
+"""Configurare implicita pentru CopySpell AI"""
+import functools
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final, Optional
+
+from dotenv import dotenv_values
+
+# Ordinea implicita de fallback intre provideri.
+_PROVIDER_PRIORITY: Final = ("groq", "deepseek", "openrouter")
+
+# Numele variabilelor de mediu pentru API keys, in ordinea campurilor.
+_API_KEY_NAMES: Final = ("DEEPSEEK_API_KEY", "GROQ_API_KEY", "OPENROUTER_API_KEY")
+_API_KEY_ATTRS: Final = ("deepseek_api_key", "groq_api_key", "openrouter_api_key")
+
+# Un singur scan compilat peste liniile .env in loc de comparatii per cheie.
+_API_KEY_RE: Final = re.compile(r"^(DEEPSEEK_API_KEY|GROQ_API_KEY|OPENROUTER_API_KEY)=")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_env(path: str, mtime: float) -> dict:
+    """Parseaza un fisier .env; cache-uit pe (cale, mtime) per proces."""
+    return dotenv_values(path)
+
+
+def _env_file_values() -> dict:
+    """Continutul .env, citit o singura data per proces.
+
+    Cheia de cache include mtime, deci o rescriere a fisierului (ex. prin
+    save_api_keys) invalideaza cache-ul automat.
+    """
+    env_path = Path(".env")
+    try:
+        mtime = env_path.stat().st_mtime
+    except OSError:
+        return {}
+    return _load_env(str(env_path), mtime)
+
+
+def _lookup_api_key(env_name: str) -> Optional[str]:
+    """Rezolva un API key din environment sau din .env, la prima accesare."""
+    value = os.environ.get(env_name)
+    if not value:
+        value = _env_file_values().get(env_name)
+    return value or None
+
+
+def _debug_flag() -> bool:
+    """Citeste flag-ul DEBUG din environment sau .env."""
+    value = os.environ.get("DEBUG") or _env_file_values().get("DEBUG") or ""
+    return str(value).lower() in ("1", "true", "yes")
+
+
+@dataclass
+class DefaultSettings:
+    """Configurari implicite - fara API keys sensibile.
+
+    Dataclass simplu in loc de pydantic BaseSettings: instantierea inseamna
+    doar atribuiri de default-uri, fara validare de model, expandare de
+    alias-uri sau parsare dotenv per constructie. Ne-frozen intentionat:
+    stratul web atribuie cheile direct (settings.x_api_key = ...) inainte
+    de save_api_keys(), iar atribuirea suprascrie memo-ul cached_property.
+    """
+
+    # App Settings
+    app_name: str = "CopySpell AI"
+    app_version: str = "1.0.0"
+    debug: bool = field(default_factory=_debug_flag)
+
+    # Rate Limiting
+    max_retries: int = 3
+    retry_delay: float = 1.0
+    timeout: int = 60
+
+    # Provider Priority (order of fallback) - tuple imuabil, partajat intre
+    # instante
+    provider_priority: tuple[str, ...] = _PROVIDER_PRIORITY
+
+    # API Keys - vor fi completate de utilizator; rezolvate lazy la prima
+    # accesare, astfel incat instantierea setarilor sa nu faca lookup-uri
+    # de environment pentru provideri nefolositi
+    @functools.cached_property
+    def deepseek_api_key(self) -> Optional[str]:
+        return _lookup_api_key("DEEPSEEK_API_KEY")
+
+    @functools.cached_property
+    def groq_api_key(self) -> Optional[str]:
+        return _lookup_api_key("GROQ_API_KEY")
+
+    @functools.cached_property
+    def openrouter_api_key(self) -> Optional[str]:
+        return _lookup_api_key("OPENROUTER_API_KEY")
+
+    @functools.cached_property
+    def config_dir(self) -> Path:
+        """Get configuration directory (created once per process)."""
+        config_path = Path.home() / ".copyspell-ai"
+        config_path.mkdir(exist_ok=True)
+        return config_path
+
+    @functools.cached_property
+    def history_file(self) -> Path:
+        """Get history file path."""
+        return self.config_dir / "history.json"
+
+    def save_api_keys(self):
+        """Save API keys to .env file."""
+        env_path = Path(".env")
+        lines = env_path.read_text().splitlines() if env_path.exists() else []
+
+        # Update or add API keys
+        keys_to_save = dict(zip(_API_KEY_NAMES, (
+            self.deepseek_api_key or "",
+            self.groq_api_key or "",
+            self.openrouter_api_key or ""
+        )))
+
+        # Single pass: rewrite known keys in place, keep everything else as-is
+        updated = []
+        seen = set()
+        for line in lines:
+            m = _API_KEY_RE.match(line)
+            if m:
+                key = m.group(1)
+                updated.append(f"{key}={keys_to_save[key]}")
+                seen.add(key)
+            else:
+                updated.append(line)
+
+        for key, value in keys_to_save.items():
+            if key not in seen:
+                updated.append(f"{key}={value}")
+
+        # O singura scriere pe un fd deschis direct; 0o600 pentru ca fisierul
+        # contine secrete
+        data = "\n".join(updated).encode("utf-8")
+        fd = os.open(env_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def has_any_api_key(self) -> bool:
+        """Check if at least one API key is configured."""
+        # Probele directe in os.environ sunt lookup-uri C si scurtcircuiteaza
+        # la primul hit; doar pe miss cadem pe campurile lazy (care pot veni
+        # si din .env)
+        env = os.environ
+        if any(env.get(name) for name in _API_KEY_NAMES):
+            return True
+        return any(getattr(self, attr) for attr in _API_KEY_ATTRS)
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> DefaultSettings:
+    """Construieste (o singura data per proces) instanta globala de setari."""
+    return DefaultSettings()
+
+
+def __getattr__(name: str):
+    # Instanta globala e construita lazy (PEP 562), astfel incat importul
+    # modulului sa nu mai parseze .env daca nimeni nu citeste setarile.
+    if name == "default_settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
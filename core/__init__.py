@@ -1,5 +1,21 @@
-from .ai_router import AIRouter
-from .content_generator import ContentGenerator
-from .rate_limiter import RateLimiter
-
-__all__ = ["AIRouter", "ContentGenerator", "RateLimiter"]
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562) so callers that
+# only need e.g. RateLimiter don't pay for the provider/httpx import chain.
+_LAZY = {
+    "AIRouter": "core.ai_router",
+    "ContentGenerator": "core.content_generator",
+    "RateLimiter": "core.rate_limiter",
+}
+
+__all__ = ["AIRouter", "ContentGenerator", "RateLimiter"]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
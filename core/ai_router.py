@@ -1,13 +1,31 @@
 """Smart AI Router for automatic provider fallback."""
 import asyncio
+import importlib
 import random
+import re
+import time
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
+import httpx
+
 from config.settings import settings
-from providers import BaseAIProvider, DeepSeekProvider, GroqProvider, OpenRouterProvider
+from providers import BaseAIProvider
 from .rate_limiter import RateLimiter, QuotaManager
 
+# Data-driven provider registry: (name, module, class, settings key attr).
+# Provider classes are resolved through importlib only when the matching API
+# key is configured, so unused providers are never instantiated.
+_PROVIDER_SPECS = (
+    ("deepseek", "providers.deepseek", "DeepSeekProvider", "deepseek_api_key"),
+    ("groq", "providers.groq", "GroqProvider", "groq_api_key"),
+    ("openrouter", "providers.openrouter", "OpenRouterProvider", "openrouter_api_key"),
+)
+
+# Matches rate-limit errors without lowercasing the whole (possibly long)
+# error body; also catches 429-only messages.
+_RATE_LIMIT_RE = re.compile(r"rate[\s_-]?limit|429|too many requests", re.I)
+
 
 @dataclass
 class RouterResult:
@@ -26,27 +44,63 @@ class AIRouter:
     
     def __init__(self):
         self.providers: Dict[str, BaseAIProvider] = {}
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = RateLimiter(providers=settings.provider_priority)
         self.quota_manager = QuotaManager()
+        # One pooled HTTP client shared by every provider: DNS, TLS and
+        # keep-alive connections are reused across requests and providers.
+        # With HTTP/2, concurrent calls multiplex over one connection per
+        # host instead of opening a socket each.
+        client_kwargs = dict(
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60
+            )
+        )
+        try:
+            self._session = httpx.AsyncClient(http2=True, **client_kwargs)
+        except ImportError:  # h2 not installed: HTTP/1.1 still works
+            self._session = httpx.AsyncClient(**client_kwargs)
         self._init_providers()
+        # Open connections ahead of the first (most latency-sensitive)
+        # generate() when a loop is already running; otherwise callers can
+        # await warm_up() themselves at startup
+        try:
+            asyncio.get_running_loop().create_task(self.warm_up())
+        except RuntimeError:
+            pass
     
     def _init_providers(self):
-        """Initialize all providers."""
-        # DeepSeek
-        if settings.deepseek_api_key:
-            self.providers["deepseek"] = DeepSeekProvider(settings.deepseek_api_key)
-        
-        # Groq
-        if settings.groq_api_key:
-            self.providers["groq"] = GroqProvider(settings.groq_api_key)
-        
-        # OpenRouter
-        if settings.openrouter_api_key:
-            self.providers["openrouter"] = OpenRouterProvider(settings.openrouter_api_key)
-    
+        """Initialize all configured providers from the registry."""
+        for name, module_name, class_name, key_attr in _PROVIDER_SPECS:
+            api_key = getattr(settings, key_attr)
+            if api_key:
+                cls = getattr(importlib.import_module(module_name), class_name)
+                self.providers[name] = cls(api_key, session=self._session)
+
+        # Provider set is fixed after init: precompute the priority rank and
+        # the available-name list instead of rebuilding them per request
+        self._priority_rank = {p: i for i, p in enumerate(settings.provider_priority)}
+        self._available_providers = list(self.providers.keys())
+
+    def reload_providers(self):
+        """Rebuild the provider set after an API key change.
+
+        Swapping only the provider objects keeps the pooled HTTP session
+        (and its warm keep-alive connections) plus the accumulated rate and
+        quota state; a full router rebuild would throw all of that away.
+        """
+        self.providers = {}
+        self._init_providers()
+        try:
+            asyncio.get_running_loop().create_task(self.warm_up())
+        except RuntimeError:
+            pass
+
     def get_available_providers(self) -> List[str]:
         """Get list of available (configured) provider names."""
-        return list(self.providers.keys())
+        return list(self._available_providers)
     
     def get_ready_providers(self) -> List[str]:
         """Get list of providers that are ready to use (not rate limited)."""
@@ -70,22 +124,136 @@ class AIRouter:
         return status
     
     def _get_provider_priority(self) -> List[str]:
-        """Get provider priority list based on availability."""
-        ready = self.get_ready_providers()
-        
-        # Sort by configured priority
-        priority = []
-        for p in settings.provider_priority:
-            if p in ready:
-                priority.append(p)
-        
-        # Add any remaining ready providers
-        for p in ready:
-            if p not in priority:
-                priority.append(p)
-        
-        return priority
+        """Get ready providers sorted by configured priority."""
+        rank = self._priority_rank
+        unranked = len(rank)
+        return sorted(self.get_ready_providers(), key=lambda p: rank.get(p, unranked))
     
+    async def _attempt(
+        self,
+        provider_name: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ):
+        """Run one admitted provider attempt.
+
+        Returns (provider_name, result_or_None, error_or_None) so callers can
+        consume it from either the sequential fallback loop or a race.
+        """
+        provider = self.providers[provider_name]
+        try:
+            result = await provider.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except Exception as e:
+            provider.set_error(str(e))
+            return provider_name, None, str(e)
+
+        if result.success:
+            return provider_name, result, None
+
+        error_msg = result.error_message or "Unknown error"
+        if _RATE_LIMIT_RE.search(error_msg):
+            # The provider's 429 handler may already have parsed Retry-After
+            # into rate_limit_reset: keep that timestamp instead of clobbering
+            # it, and hand the relative delay to the limiter so acquire()'s
+            # precise wake-up event actually gets armed
+            reset_at = provider.rate_limit_reset
+            provider.set_rate_limited(reset_at)
+            reset_after = reset_at - time.time() if reset_at else None
+            if reset_after is not None and reset_after <= 0:
+                reset_after = None
+            self.rate_limiter.set_rate_limited(provider_name, reset_after=reset_after)
+        return provider_name, None, error_msg
+
+    async def _generate_race(
+        self,
+        provider_order: List[str],
+        prompt: str,
+        system_prompt: Optional[str],
+        model: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        max_parallel: int = 2
+    ) -> RouterResult:
+        """Race the top ready providers; first success wins, rest cancelled."""
+        errors = []
+        admitted = []
+        for name in provider_order:
+            if len(admitted) >= max_parallel:
+                break
+            ok, wait_time = self.rate_limiter.try_acquire(name)
+            if ok:
+                admitted.append(name)
+            else:
+                errors.append(f"{name}: Rate limited, wait {wait_time:.0f}s")
+
+        if not admitted:
+            return RouterResult(
+                success=False,
+                content="",
+                provider_used="",
+                model_used="",
+                tokens_used=None,
+                attempts=0,
+                errors=errors or ["No providers available."]
+            )
+
+        tasks = [
+            asyncio.create_task(self._attempt(
+                name, prompt, system_prompt, model, temperature, max_tokens
+            ))
+            for name in admitted
+        ]
+        attempts = len(tasks)
+        winner = None
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, result, error = task.result()
+                if result is not None and winner is None:
+                    winner = (name, result)
+                elif error:
+                    errors.append(f"{name}: {error}")
+
+        # Cancel the losers and reap their cancellations
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner:
+            name, result = winner
+            self.quota_manager.record_usage(name, result.tokens_used or 0)
+            self.rate_limiter.record_success(name)
+            return RouterResult(
+                success=True,
+                content=result.content,
+                provider_used=name,
+                model_used=result.model,
+                tokens_used=result.tokens_used,
+                attempts=attempts,
+                errors=errors
+            )
+
+        return RouterResult(
+            success=False,
+            content="",
+            provider_used="",
+            model_used="",
+            tokens_used=None,
+            attempts=attempts,
+            errors=errors
+        )
+
     async def generate(
         self,
         prompt: str,
@@ -94,9 +262,15 @@ class AIRouter:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        race: bool = False
     ) -> RouterResult:
-        """Generate content with automatic provider fallback."""
+        """Generate content with automatic provider fallback.
+
+        With race=True the top ready providers are queried concurrently and
+        the first success wins, hiding slow-provider tail latency at the cost
+        of extra requests.
+        """
         errors = []
         attempts = 0
         
@@ -123,68 +297,48 @@ class AIRouter:
                 attempts=0,
                 errors=["No providers available. Please configure at least one API key."]
             )
-        
+
+        # Speculative mode: query the top providers concurrently
+        if race and len(provider_order) > 1:
+            return await self._generate_race(
+                provider_order, prompt, system_prompt, model, temperature, max_tokens
+            )
+
         # Try each provider
         for provider_name in provider_order:
             if attempts >= max_retries:
                 break
-            
-            provider = self.providers.get(provider_name)
-            if not provider:
+
+            # Single-call token-bucket admission (check + wait query + slot)
+            admitted, wait_time = self.rate_limiter.try_acquire(provider_name)
+            if not admitted:
+                errors.append(f"{provider_name}: Rate limited, wait {wait_time:.0f}s")
                 continue
-            
-            # Check rate limit
-            if self.rate_limiter.is_rate_limited(provider_name):
-                wait_time = self.rate_limiter.time_until_available(provider_name)
-                if wait_time > 0:
-                    errors.append(f"{provider_name}: Rate limited, wait {wait_time:.0f}s")
-                    continue
-            
-            try:
-                # Acquire rate limit slot
-                await self.rate_limiter.acquire(provider_name)
-                
-                try:
-                    attempts += 1
-                    result = await provider.generate(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens
-                    )
-                    
-                    if result.success:
-                        # Record usage
-                        self.quota_manager.record_usage(
-                            provider_name,
-                            result.tokens_used or 0
-                        )
-                        
-                        return RouterResult(
-                            success=True,
-                            content=result.content,
-                            provider_used=provider_name,
-                            model_used=result.model,
-                            tokens_used=result.tokens_used,
-                            attempts=attempts,
-                            errors=errors
-                        )
-                    else:
-                        error_msg = result.error_message or "Unknown error"
-                        errors.append(f"{provider_name}: {error_msg}")
-                        
-                        # Check if rate limited
-                        if "rate limit" in error_msg.lower():
-                            provider.set_rate_limited()
-                            self.rate_limiter.set_rate_limited(provider_name)
-                        
-                finally:
-                    self.rate_limiter.release(provider_name)
-                    
-            except Exception as e:
-                errors.append(f"{provider_name}: {str(e)}")
-                provider.set_error(str(e))
+
+            attempts += 1
+            _, result, error = await self._attempt(
+                provider_name, prompt, system_prompt, model, temperature, max_tokens
+            )
+
+            if result is not None:
+                # Record usage
+                self.quota_manager.record_usage(
+                    provider_name,
+                    result.tokens_used or 0
+                )
+                self.rate_limiter.record_success(provider_name)
+
+                return RouterResult(
+                    success=True,
+                    content=result.content,
+                    provider_used=provider_name,
+                    model_used=result.model,
+                    tokens_used=result.tokens_used,
+                    attempts=attempts,
+                    errors=errors
+                )
+
+            errors.append(f"{provider_name}: {error}")
         
         # All providers failed
         return RouterResult(
@@ -228,8 +382,8 @@ class AIRouter:
         
         try:
             await self.rate_limiter.acquire(provider_name)
-            
-            try:
+
+            async with self.rate_limiter.concurrency_slot(provider_name):
                 async for chunk in provider.generate_stream(
                     prompt=prompt,
                     system_prompt=system_prompt,
@@ -238,13 +392,35 @@ class AIRouter:
                     max_tokens=max_tokens
                 ):
                     yield chunk
-                    
-            finally:
-                self.rate_limiter.release(provider_name)
-                
+
         except Exception as e:
             yield f"[Error: {str(e)}]"
     
+    async def _warm_one(self, provider: BaseAIProvider):
+        try:
+            await self._session.head(provider.config.base_url, timeout=5.0)
+        except (httpx.HTTPError, OSError):
+            pass  # best-effort: the pool just stays cold for this host
+
+    async def warm_up(self):
+        """Pre-open keep-alive connections to every configured provider.
+
+        A best-effort HEAD per host pays the TCP+TLS handshake during
+        startup, so the first user-visible generate() lands on an already
+        warm connection instead of adding the full RTT to its latency.
+        """
+        await asyncio.gather(*(self._warm_one(p) for p in self.providers.values()))
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        await self._session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
     def reset_provider(self, provider_name: str):
         """Reset a provider's status."""
         if provider_name in self.providers:
@@ -258,12 +434,22 @@ class AIRouter:
         """Get usage statistics for all providers."""
         return self.quota_manager.get_all_usage()
     
+    async def _check_one(self, provider_name: str) -> bool:
+        """Bounded availability probe for a single provider.
+
+        Catches only expected network/timeout failures so cooperative
+        cancellation still propagates, and caps each probe at 5 seconds.
+        """
+        try:
+            return bool(await asyncio.wait_for(
+                self.providers[provider_name].check_availability(),
+                timeout=5.0
+            ))
+        except (asyncio.TimeoutError, httpx.HTTPError, OSError):
+            return False
+
     async def health_check(self) -> Dict[str, bool]:
-        """Check health of all providers."""
-        results = {}
-        for name, provider in self.providers.items():
-            try:
-                results[name] = await provider.check_availability()
-            except:
-                results[name] = False
-        return results
+        """Check health of all providers concurrently."""
+        names = list(self.providers)
+        results = await asyncio.gather(*(self._check_one(name) for name in names))
+        return dict(zip(names, results))
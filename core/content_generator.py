@@ -1,355 +1,812 @@
-"""Main content generation orchestrator."""
-from typing import Optional, Dict, Any, AsyncGenerator
-import json
-from datetime import datetime
-
-from config.prompts import PromptTemplates
-from config.settings import settings
-from models import AUDIENCES, TONES, CONTENT_TYPES, FRAMEWORKS
-from models.audience import get_audience_by_id, create_custom_audience
-from models.tone import get_tone_by_id, create_custom_tone
-from models.content_types import get_content_type_by_id, create_custom_content_type, create_custom_framework
-from .ai_router import AIRouter, RouterResult
-
-
-class ContentGenerator:
-    """Main class for generating marketing content."""
-    
-    def __init__(self):
-        self.router = AIRouter()
-        self.history: list[Dict[str, Any]] = []
-        self._load_history()
-    
-    def _load_history(self):
-        """Load generation history from file."""
-        try:
-            if settings.history_file.exists():
-                with open(settings.history_file, "r", encoding="utf-8") as f:
-                    self.history = json.load(f)
-        except Exception:
-            self.history = []
-    
-    def _save_history(self):
-        """Save generation history to file."""
-        try:
-            with open(settings.history_file, "w", encoding="utf-8") as f:
-                json.dump(self.history[-100:], f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-    
-    def add_to_history(
-        self,
-        keywords: str,
-        content_type: str,
-        framework: str,
-        audience: str,
-        tone: str,
-        result: RouterResult,
-        word_count: str = "normal"
-    ):
-        """Add a generation to history."""
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "keywords": keywords,
-            "content_type": content_type,
-            "framework": framework,
-            "audience": audience,
-            "tone": tone,
-            "content": result.content if result.success else None,
-            "provider": result.provider_used,
-            "success": result.success,
-            "tokens": result.tokens_used,
-            "word_count": word_count
-        }
-        self.history.append(entry)
-        self._save_history()
-    
-    def get_history(self, limit: int = 20) -> list[Dict[str, Any]]:
-        """Get recent generation history."""
-        return self.history[-limit:][::-1]
-    
-    def clear_history(self):
-        """Clear generation history."""
-        self.history = []
-        self._save_history()
-    
-    async def generate(
-        self,
-        keywords: str,
-        content_type_id: str,
-        framework: str,
-        audience_id: str,
-        tone_id: str,
-        additional_context: str = "",
-        preferred_provider: Optional[str] = None,
-        word_count: str = "normal",
-        custom_audience: Optional[Dict] = None,
-        custom_tone: Optional[Dict] = None,
-        custom_content_type: Optional[Dict] = None,
-        custom_framework: Optional[Dict] = None
-    ) -> RouterResult:
-        """Generate content based on parameters, with support for custom options."""
-        
-        # Handle custom audience if provided
-        if custom_audience and audience_id.startswith("custom_"):
-            audience = create_custom_audience(
-                name=custom_audience.get("name", "Custom Audience"),
-                description=custom_audience.get("description", "Custom audience description"),
-                pain_points=custom_audience.get("pain_points", []),
-                desires=custom_audience.get("desires", []),
-                objections=custom_audience.get("objections", []),
-                language_style=custom_audience.get("language_style", "Casual")
-            )
-        else:
-            audience = get_audience_by_id(audience_id)
-        
-        # Handle custom tone if provided
-        if custom_tone and tone_id.startswith("custom_"):
-            tone = create_custom_tone(
-                name=custom_tone.get("name", "Custom Tone"),
-                description=custom_tone.get("description", "Custom tone description"),
-                characteristics=custom_tone.get("characteristics", []),
-                examples=custom_tone.get("examples", []),
-                best_for=custom_tone.get("best_for", [])
-            )
-        else:
-            tone = get_tone_by_id(tone_id)
-        
-        # Handle custom content type if provided
-        if custom_content_type and content_type_id.startswith("custom_"):
-            content_type = create_custom_content_type(
-                name=custom_content_type.get("name", "Custom Content Type"),
-                description=custom_content_type.get("description", "Custom content type description"),
-                optimal_length=custom_content_type.get("optimal_length", "Variable"),
-                key_elements=custom_content_type.get("key_elements", []),
-                best_practices=custom_content_type.get("best_practices", []),
-                platforms=custom_content_type.get("platforms", [])
-            )
-        else:
-            content_type = get_content_type_by_id(content_type_id)
-        
-        # Handle custom framework if provided
-        if custom_framework and framework.startswith("custom_"):
-            create_custom_framework(
-                name=custom_framework.get("name", "Custom Framework"),
-                description=custom_framework.get("description", "Custom framework description"),
-                steps=custom_framework.get("steps", []),
-                best_for=custom_framework.get("best_for", [])
-            )
-            # Use the custom framework name in the prompt
-            framework = custom_framework.get("name", "Custom Framework")
-        
-        # Build detailed audience description
-        audience_desc = f"""{audience.name}
-Descriere: {audience.description}
-Pain points: {', '.join(audience.pain_points[:3])}
-Dorințe: {', '.join(audience.desires[:3])}
-Stil de limbaj preferat: {audience.language_style}"""
-        
-        # Build detailed tone description
-        tone_desc = f"""{tone.name}
-Descriere: {tone.description}
-Caracteristici: {', '.join(tone.characteristics[:3])}
-Exemple: {' | '.join(tone.examples[:2])}"""
-        
-        # Build prompt
-        prompt = PromptTemplates.build_prompt(
-            keywords=keywords,
-            audience=audience_desc,
-            tone=tone_desc,
-            content_type=content_type.name,
-            framework=framework,
-            additional_context=additional_context,
-            word_count=word_count
-        )
-        
-        # Add hashtags for Instagram
-        if content_type_id == "instagram_caption":
-            prompt += "\n\nLa final, adaugă hashtag-uri relevante (15-30)."
-        
-        # Generate
-        result = await self.router.generate(
-            prompt=prompt,
-            system_prompt=PromptTemplates.SYSTEM_PROMPT,
-            preferred_provider=preferred_provider
-        )
-        
-        # Add to history
-        self.add_to_history(
-            keywords=keywords,
-            content_type=content_type.name,
-            framework=framework,
-            audience=audience.name,
-            tone=tone.name,
-            result=result,
-            word_count=word_count
-        )
-        
-        return result
-    
-    async def generate_stream(
-        self,
-        keywords: str,
-        content_type_id: str,
-        framework: str,
-        audience_id: str,
-        tone_id: str,
-        additional_context: str = "",
-        preferred_provider: Optional[str] = None,
-        word_count: str = "normal",
-        custom_audience: Optional[Dict] = None,
-        custom_tone: Optional[Dict] = None,
-        custom_content_type: Optional[Dict] = None,
-        custom_framework: Optional[Dict] = None
-    ) -> AsyncGenerator[str, None]:
-        """Generate content with streaming, with support for custom options."""
-        
-        # Handle custom audience if provided
-        if custom_audience and audience_id.startswith("custom_"):
-            audience = create_custom_audience(
-                name=custom_audience.get("name", "Custom Audience"),
-                description=custom_audience.get("description", "Custom audience description"),
-                pain_points=custom_audience.get("pain_points", []),
-                desires=custom_audience.get("desires", []),
-                objections=custom_audience.get("objections", []),
-                language_style=custom_audience.get("language_style", "Casual")
-            )
-        else:
-            audience = get_audience_by_id(audience_id)
-        
-        # Handle custom tone if provided
-        if custom_tone and tone_id.startswith("custom_"):
-            tone = create_custom_tone(
-                name=custom_tone.get("name", "Custom Tone"),
-                description=custom_tone.get("description", "Custom tone description"),
-                characteristics=custom_tone.get("characteristics", []),
-                examples=custom_tone.get("examples", []),
-                best_for=custom_tone.get("best_for", [])
-            )
-        else:
-            tone = get_tone_by_id(tone_id)
-        
-        # Handle custom content type if provided
-        if custom_content_type and content_type_id.startswith("custom_"):
-            content_type = create_custom_content_type(
-                name=custom_content_type.get("name", "Custom Content Type"),
-                description=custom_content_type.get("description", "Custom content type description"),
-                optimal_length=custom_content_type.get("optimal_length", "Variable"),
-                key_elements=custom_content_type.get("key_elements", []),
-                best_practices=custom_content_type.get("best_practices", []),
-                platforms=custom_content_type.get("platforms", [])
-            )
-        else:
-            content_type = get_content_type_by_id(content_type_id)
-        
-        # Handle custom framework if provided
-        if custom_framework and framework.startswith("custom_"):
-            create_custom_framework(
-                name=custom_framework.get("name", "Custom Framework"),
-                description=custom_framework.get("description", "Custom framework description"),
-                steps=custom_framework.get("steps", []),
-                best_for=custom_framework.get("best_for", [])
-            )
-            # Use the custom framework name in the prompt
-            framework = custom_framework.get("name", "Custom Framework")
-        
-        # Build descriptions
-        audience_desc = f"""{audience.name} - {audience.description}
-Pain points: {', '.join(audience.pain_points[:3])}
-Dorințe: {', '.join(audience.desires[:3])}"""
-        
-        tone_desc = f"""{tone.name} - {tone.description}"""
-        
-        # Build prompt
-        prompt = PromptTemplates.build_prompt(
-            keywords=keywords,
-            audience=audience_desc,
-            tone=tone_desc,
-            content_type=content_type.name,
-            framework=framework,
-            additional_context=additional_context,
-            word_count=word_count
-        )
-        
-        if content_type_id == "instagram_caption":
-            prompt += "\n\nLa final, adaugă hashtag-uri relevante (15-30)."
-        
-        # Stream generate
-        full_content = []
-        async for chunk in self.router.generate_with_stream(
-            prompt=prompt,
-            system_prompt=PromptTemplates.SYSTEM_PROMPT,
-            preferred_provider=preferred_provider
-        ):
-            full_content.append(chunk)
-            yield chunk
-        
-        # Save to history after streaming completes
-        content = "".join(full_content)
-        if not content.startswith("[Error"):
-            self.add_to_history(
-                keywords=keywords,
-                content_type=content_type.name,
-                framework=framework,
-                audience=audience.name,
-                tone=tone.name,
-                result=RouterResult(
-                    success=True,
-                    content=content,
-                    provider_used="streaming",
-                    model_used="unknown",
-                    tokens_used=None,
-                    attempts=1,
-                    errors=[]
-                ),
-                word_count=word_count
-            )
-    
-    def get_options(self) -> Dict[str, Any]:
-        """Get all available options for UI."""
-        return {
-            "audiences": [
-                {"id": a.id, "name": a.name, "description": a.description}
-                for a in AUDIENCES
-            ],
-            "tones": [
-                {"id": t.id, "name": t.name, "description": t.description}
-                for t in TONES
-            ],
-            "content_types": [
-                {"id": ct.id, "name": ct.name, "description": ct.description}
-                for ct in CONTENT_TYPES
-            ],
-            "frameworks": [
-                {
-                    "name": name,
-                    "description": data["description"],
-                    "best_for": data["best_for"]
-                }
-                for name, data in FRAMEWORKS.items()
-            ],
-            "providers": self.router.get_available_providers()
-        }
-    
-    def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get provider status for UI."""
-        return self.router.get_provider_status()
-    
-    def get_usage_stats(self) -> Dict[str, Dict]:
-        """Get usage statistics."""
-        return self.router.get_usage_stats()
-    
-    async def generate_from_prompt(
-        self,
-        prompt: str,
-        preferred_provider: Optional[str] = None,
-        max_tokens: int = 2000
-    ) -> RouterResult:
-        """Generate content from a custom prompt."""
-        result = await self.router.generate(
-            prompt=prompt,
-            system_prompt=PromptTemplates.SYSTEM_PROMPT,
-            preferred_provider=preferred_provider,
-            max_tokens=max_tokens
-        )
-        return result
+"""Main content generation orchestrator."""
+import asyncio
+import functools
+import io
+import itertools
+import threading
+import time
+from typing import Optional, Dict, Any, AsyncGenerator
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import aiofiles
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:  # degrade gracefully to stdlib json
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+from config.prompts import PromptTemplates
+from config.settings import settings
+from models import AUDIENCES, TONES, CONTENT_TYPES, FRAMEWORKS
+from models.audience import get_audience_by_id, create_custom_audience
+from models.tone import get_tone_by_id, create_custom_tone
+from models.content_types import get_content_type_by_id, create_custom_content_type, create_custom_framework
+from .ai_router import AIRouter, RouterResult
+
+# The by-id helpers scan their option lists linearly; the id spaces are small
+# and static, so memoize them here and repeated generations with the same ids
+# collapse to dict hits.
+get_audience_by_id = functools.lru_cache(maxsize=None)(get_audience_by_id)
+get_tone_by_id = functools.lru_cache(maxsize=None)(get_tone_by_id)
+get_content_type_by_id = functools.lru_cache(maxsize=None)(get_content_type_by_id)
+
+# build_prompt is pure on its arguments; cache recent combinations so repeat
+# generations skip the string assembly entirely.
+_build_prompt_cached = functools.lru_cache(maxsize=256)(PromptTemplates.build_prompt)
+
+
+def _format_audience_desc(audience) -> str:
+    """Detailed audience description for the main prompt."""
+    return f"""{audience.name}
+Descriere: {audience.description}
+Pain points: {', '.join(audience.pain_points[:3])}
+Dorințe: {', '.join(audience.desires[:3])}
+Stil de limbaj preferat: {audience.language_style}"""
+
+
+def _format_tone_desc(tone) -> str:
+    """Detailed tone description for the main prompt."""
+    return f"""{tone.name}
+Descriere: {tone.description}
+Caracteristici: {', '.join(tone.characteristics[:3])}
+Exemple: {' | '.join(tone.examples[:2])}"""
+
+
+def _format_audience_brief(audience) -> str:
+    """Shorter audience description used by the streaming path."""
+    return f"""{audience.name} - {audience.description}
+Pain points: {', '.join(audience.pain_points[:3])}
+Dorințe: {', '.join(audience.desires[:3])}"""
+
+
+def _format_tone_brief(tone) -> str:
+    """Shorter tone description used by the streaming path."""
+    return f"{tone.name} - {tone.description}"
+
+
+def _freeze_custom(payload: Dict) -> tuple:
+    """Normalize a custom_* payload into a hashable cache key."""
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in payload.items()
+    ))
+
+
+def _thaw(key: tuple) -> Dict:
+    """Rebuild the payload dict from a frozen cache key."""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in key}
+
+
+# "Regenerate with tweaks" flows send the same custom payload repeatedly
+# (often once for generate and again for generate_stream); memoize the
+# factories so identical payloads reuse the constructed objects.
+@functools.lru_cache(maxsize=64)
+def _custom_audience_cached(key: tuple):
+    d = _thaw(key)
+    return create_custom_audience(
+        name=d.get("name", "Custom Audience"),
+        description=d.get("description", "Custom audience description"),
+        pain_points=d.get("pain_points", []),
+        desires=d.get("desires", []),
+        objections=d.get("objections", []),
+        language_style=d.get("language_style", "Casual")
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _custom_tone_cached(key: tuple):
+    d = _thaw(key)
+    return create_custom_tone(
+        name=d.get("name", "Custom Tone"),
+        description=d.get("description", "Custom tone description"),
+        characteristics=d.get("characteristics", []),
+        examples=d.get("examples", []),
+        best_for=d.get("best_for", [])
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _custom_content_type_cached(key: tuple):
+    d = _thaw(key)
+    return create_custom_content_type(
+        name=d.get("name", "Custom Content Type"),
+        description=d.get("description", "Custom content type description"),
+        optimal_length=d.get("optimal_length", "Variable"),
+        key_elements=d.get("key_elements", []),
+        best_practices=d.get("best_practices", []),
+        platforms=d.get("platforms", [])
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _custom_framework_cached(key: tuple) -> str:
+    d = _thaw(key)
+    create_custom_framework(
+        name=d.get("name", "Custom Framework"),
+        description=d.get("description", "Custom framework description"),
+        steps=d.get("steps", []),
+        best_for=d.get("best_for", [])
+    )
+    # The prompt only needs the (registered) framework name
+    return d.get("name", "Custom Framework")
+
+
+# By-id variants are pure over the static option lists, so memoize the final
+# strings; the custom_* path formats directly from the ad-hoc object.
+_audience_desc_by_id = functools.lru_cache(maxsize=256)(
+    lambda audience_id: _format_audience_desc(get_audience_by_id(audience_id)))
+_tone_desc_by_id = functools.lru_cache(maxsize=256)(
+    lambda tone_id: _format_tone_desc(get_tone_by_id(tone_id)))
+_audience_brief_by_id = functools.lru_cache(maxsize=256)(
+    lambda audience_id: _format_audience_brief(get_audience_by_id(audience_id)))
+_tone_brief_by_id = functools.lru_cache(maxsize=256)(
+    lambda tone_id: _format_tone_brief(get_tone_by_id(tone_id)))
+
+
+_STREAM_DONE = object()
+
+
+async def _coalesce(source, max_wait: float = 0.02, max_chunks: int = 32):
+    """Batch adjacent stream chunks into fewer, larger yields.
+
+    A feeder task moves chunks from the source onto a bounded queue; the
+    consumer drains whatever arrives within the batching window into a single
+    string, cutting per-token event-loop round trips without adding visible
+    latency. The bound gives cooperative backpressure: when the consumer
+    (e.g. an SSE client on a slow link) falls behind, the feeder blocks on
+    put() and upstream stops pulling tokens instead of buffering them in RAM.
+    Closing the generator cancels the feeder, which closes the source stream.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+
+    async def _feed():
+        try:
+            async for chunk in source:
+                await queue.put(chunk)
+        except asyncio.CancelledError:
+            raise  # consumer closed us; nobody is waiting for the sentinel
+        except Exception:
+            pass  # provider streams report errors in-band; just end the stream
+        await queue.put(_STREAM_DONE)
+
+    feeder = asyncio.create_task(_feed())
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _STREAM_DONE:
+                break
+            parts = [chunk]
+            exhausted = False
+            deadline = loop.time() + max_wait
+            while len(parts) < max_chunks:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if nxt is _STREAM_DONE:
+                    exhausted = True
+                    break
+                parts.append(nxt)
+            yield "".join(parts) if len(parts) > 1 else parts[0]
+            if exhausted:
+                break
+    finally:
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
+
+
+# Trailing entries kept in memory / after compaction, and the file size at
+# which the append-only history log gets compacted.
+_HISTORY_LIMIT = 100
+_HISTORY_MAX_BYTES = 256 * 1024
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """One generation record kept in the history deque.
+
+    Slots keep the ~100 live records compact; entries are converted to dicts
+    only at the serialization boundaries (JSONL flush, get_history).
+    """
+    timestamp: Any = 0.0  # float epoch for new entries, ISO string in legacy files
+    keywords: str = ""
+    content_type: str = ""
+    framework: str = ""
+    audience: str = ""
+    tone: str = ""
+    content: Optional[str] = None
+    provider: str = ""
+    success: bool = True
+    tokens: Optional[int] = None
+    word_count: str = "normal"
+
+
+_HISTORY_FIELDS = frozenset(HistoryEntry.__dataclass_fields__)
+
+@dataclass
+class ResolvedOptions:
+    """Audience/tone/content-type/framework resolved for one generation.
+
+    The custom flags are computed once during resolution so downstream code
+    branches on a bool instead of repeating the startswith checks.
+    """
+    audience: Any
+    tone: Any
+    content_type: Any
+    framework: str
+    audience_is_custom: bool = False
+    tone_is_custom: bool = False
+
+
+# Request-scoped memo for provider status: several UI panels ask for the same
+# snapshot while rendering one page, so the dict is built once per context.
+# Callers reset at request boundaries via reset_status_cache().
+_STATUS_CACHE: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar(
+    "_provider_status_cache", default=None)
+
+
+def reset_status_cache():
+    """Invalidate the request-scoped provider-status memo."""
+    _STATUS_CACHE.set(None)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_static_options() -> Dict[str, Any]:
+    """UI option payload minus the provider list.
+
+    The option registries are module constants, so this is built once per
+    process and shared across ContentGenerator instances.
+    """
+    return {
+        "audiences": [
+            {"id": a.id, "name": a.name, "description": a.description}
+            for a in AUDIENCES
+        ],
+        "tones": [
+            {"id": t.id, "name": t.name, "description": t.description}
+            for t in TONES
+        ],
+        "content_types": [
+            {"id": ct.id, "name": ct.name, "description": ct.description}
+            for ct in CONTENT_TYPES
+        ],
+        "frameworks": [
+            {
+                "name": name,
+                "description": data["description"],
+                "best_for": data["best_for"]
+            }
+            for name, data in FRAMEWORKS.items()
+        ],
+    }
+
+
+# Identical generate() requests skip the upstream LLM round-trip entirely;
+# LRU-bounded so regeneration sprees can't grow memory, TTL-bounded so a
+# long-lived server doesn't keep serving stale copy forever.
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL = 15 * 60  # seconds
+
+
+def _normalize_for_cache(text: str) -> str:
+    """Fold trivial free-text variation out of the cache key.
+
+    "Slabire, detox" and " slabire,  DETOX " are the same request as far as
+    the generated copy is concerned; lowercasing and collapsing whitespace
+    lets them share one cache entry. The original text still goes into the
+    prompt untouched.
+    """
+    return " ".join(text.lower().split())
+
+
+# Streaming history capture: stop buffering past the cap and keep only a
+# head/tail excerpt so multi-MB streams don't get materialized twice.
+_STREAM_HISTORY_CAP = 8192
+_STREAM_HEAD_CHARS = 2048
+_STREAM_TAIL_CHARS = 2048
+
+
+class ContentGenerator:
+    """Main class for generating marketing content."""
+
+    def __init__(self):
+        self.router = AIRouter()
+        # Bounded deque: appends are O(1) and trimming to the last
+        # _HISTORY_LIMIT entries is automatic
+        self.history: deque = deque(maxlen=_HISTORY_LIMIT)
+        # Append-only JSONL log drained by a lazily started writer task
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._history_path = settings.history_file.with_suffix(".jsonl")
+        self._static_options = _build_static_options()
+        # Exact-match response cache: full request signature ->
+        # (RouterResult, monotonic insert time); hit/miss counters back the
+        # /api/cache/stats endpoint
+        self._response_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # In-flight generate() calls by cache key: concurrent duplicates
+        # share one upstream request instead of racing N identical prompts
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        # History loads off-thread so instantiation (and server startup)
+        # doesn't wait on disk; the lock orders loader vs. new appends
+        self._history_lock = threading.Lock()
+        threading.Thread(target=self._load_history, daemon=True).start()
+
+    def _load_history(self):
+        """Load generation history (JSONL tail, or the legacy JSON file)."""
+        entries = []
+        try:
+            if self._history_path.exists():
+                with open(self._history_path, "rb") as f:
+                    lines = f.readlines()[-_HISTORY_LIMIT:]
+                raw = [_json_loads(line) for line in lines if line.strip()]
+            elif settings.history_file.exists():
+                raw = _json_loads(settings.history_file.read_bytes())
+            else:
+                raw = []
+            # Unknown keys from older formats are dropped, missing ones default
+            entries = [
+                HistoryEntry(**{k: v for k, v in d.items() if k in _HISTORY_FIELDS})
+                for d in raw
+            ]
+        except Exception:
+            return
+        with self._history_lock:
+            # Loaded (older) entries go in front of anything generated while
+            # the load was still running
+            self.history.extendleft(reversed(entries))
+
+    def _rewrite_history_file(self):
+        """Rewrite the JSONL log from the trailing in-memory entries."""
+        with self._history_lock:
+            snapshot = list(self.history)
+        try:
+            with open(self._history_path, "wb") as f:
+                for entry in snapshot:
+                    f.write(_json_dumps(asdict(entry)) + b"\n")
+        except Exception:
+            pass
+
+    def _maybe_rotate(self):
+        """Compact the log once it grows past the size threshold."""
+        try:
+            if self._history_path.stat().st_size > _HISTORY_MAX_BYTES:
+                self._rewrite_history_file()
+        except OSError:
+            pass
+
+    def _append_entry_sync(self, entry: "HistoryEntry"):
+        """Append one entry to the log (fallback outside async contexts)."""
+        try:
+            with open(self._history_path, "ab") as f:
+                f.write(_json_dumps(asdict(entry)) + b"\n")
+        except Exception:
+            pass
+        self._maybe_rotate()
+
+    async def _writer(self):
+        """Dedicated writer task: drains the queue and appends entries.
+
+        Each entry is O(1) to persist - old entries are never re-encoded -
+        and bursts are drained into a single append.
+        """
+        while True:
+            entries = [await self._write_q.get()]
+            while not self._write_q.empty():
+                entries.append(self._write_q.get_nowait())
+            data = b"".join(_json_dumps(asdict(e)) + b"\n" for e in entries)
+            try:
+                async with aiofiles.open(self._history_path, "ab") as f:
+                    await f.write(data)
+            except Exception:
+                pass
+            for _ in entries:
+                self._write_q.task_done()
+            # Compaction re-encodes up to 100 entries; keep it off the loop
+            await asyncio.to_thread(self._maybe_rotate)
+
+    def _enqueue_entry(self, entry: "HistoryEntry"):
+        """Hand an entry to the background writer without blocking."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append_entry_sync(entry)
+            return
+
+        if self._write_q is None:
+            self._write_q = asyncio.Queue()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = loop.create_task(self._writer())
+        self._write_q.put_nowait(entry)
+    
+    def add_to_history(
+        self,
+        keywords: str,
+        content_type: str,
+        framework: str,
+        audience: str,
+        tone: str,
+        result: RouterResult,
+        word_count: str = "normal"
+    ):
+        """Add a generation to history."""
+        entry = HistoryEntry(
+            # Float epoch: no datetime object / strftime on the hot path;
+            # formatted lazily when history is served
+            timestamp=time.time(),
+            keywords=keywords,
+            content_type=content_type,
+            framework=framework,
+            audience=audience,
+            tone=tone,
+            content=result.content if result.success else None,
+            provider=result.provider_used,
+            success=result.success,
+            tokens=result.tokens_used,
+            word_count=word_count
+        )
+        self._append_entry(entry)
+
+    def _append_entry(self, entry: "HistoryEntry"):
+        """Append a prepared entry to memory and the background log."""
+        with self._history_lock:
+            self.history.append(entry)
+        self._enqueue_entry(entry)
+
+    def get_history(self, limit: int = 20) -> list[Dict[str, Any]]:
+        """Get recent generation history (newest first, display-ready)."""
+        with self._history_lock:
+            newest = list(itertools.islice(reversed(self.history), limit))
+        recent = []
+        for entry in newest:
+            d = asdict(entry)
+            ts = d["timestamp"]
+            if isinstance(ts, (int, float)):
+                d["timestamp"] = datetime.fromtimestamp(ts).isoformat()
+            recent.append(d)
+        return recent
+
+    def clear_history(self):
+        """Clear generation history."""
+        with self._history_lock:
+            self.history.clear()
+        self._rewrite_history_file()
+    
+    def _resolve_options(
+        self,
+        content_type_id: str,
+        framework: str,
+        audience_id: str,
+        tone_id: str,
+        custom_audience: Optional[Dict],
+        custom_tone: Optional[Dict],
+        custom_content_type: Optional[Dict],
+        custom_framework: Optional[Dict]
+    ) -> ResolvedOptions:
+        """Resolve ids / custom payloads into option objects.
+
+        Shared by the blocking and streaming generation paths so the
+        custom-option dispatch exists exactly once.
+        """
+        # Each "is custom" check is evaluated exactly once per request
+        audience_is_custom = bool(custom_audience) and audience_id.startswith("custom_")
+        tone_is_custom = bool(custom_tone) and tone_id.startswith("custom_")
+
+        # Handle custom audience if provided
+        if audience_is_custom:
+            audience = _custom_audience_cached(_freeze_custom(custom_audience))
+        else:
+            audience = get_audience_by_id(audience_id)
+
+        # Handle custom tone if provided
+        if tone_is_custom:
+            tone = _custom_tone_cached(_freeze_custom(custom_tone))
+        else:
+            tone = get_tone_by_id(tone_id)
+
+        # Handle custom content type if provided
+        if custom_content_type and content_type_id.startswith("custom_"):
+            content_type = _custom_content_type_cached(
+                _freeze_custom(custom_content_type))
+        else:
+            content_type = get_content_type_by_id(content_type_id)
+
+        # Handle custom framework if provided (registers it and returns the
+        # name used in the prompt)
+        if custom_framework and framework.startswith("custom_"):
+            framework = _custom_framework_cached(_freeze_custom(custom_framework))
+
+        return ResolvedOptions(
+            audience, tone, content_type, framework,
+            audience_is_custom=audience_is_custom,
+            tone_is_custom=tone_is_custom
+        )
+
+    async def generate(
+        self,
+        keywords: str,
+        content_type_id: str,
+        framework: str,
+        audience_id: str,
+        tone_id: str,
+        additional_context: str = "",
+        preferred_provider: Optional[str] = None,
+        word_count: str = "normal",
+        custom_audience: Optional[Dict] = None,
+        custom_tone: Optional[Dict] = None,
+        custom_content_type: Optional[Dict] = None,
+        custom_framework: Optional[Dict] = None
+    ) -> RouterResult:
+        """Generate content based on parameters, with support for custom options."""
+
+        cache_key = (
+            _normalize_for_cache(keywords), content_type_id, framework,
+            audience_id, tone_id,
+            _normalize_for_cache(additional_context), word_count,
+            preferred_provider,
+            _freeze_custom(custom_audience) if custom_audience else None,
+            _freeze_custom(custom_tone) if custom_tone else None,
+            _freeze_custom(custom_content_type) if custom_content_type else None,
+            _freeze_custom(custom_framework) if custom_framework else None,
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            result, stored_at = cached
+            if time.monotonic() - stored_at < _RESPONSE_CACHE_TTL:
+                # Identical request: serve the stored result, skip the LLM call
+                self._response_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                return result
+            del self._response_cache[cache_key]
+        self._cache_misses += 1
+
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            # Same request already running: ride along on its result;
+            # shield() keeps one caller's cancellation from killing the rest
+            return await asyncio.shield(pending)
+        task = asyncio.ensure_future(self._generate_uncached(
+            cache_key, keywords, content_type_id, framework, audience_id,
+            tone_id, additional_context, preferred_provider, word_count,
+            custom_audience, custom_tone, custom_content_type,
+            custom_framework
+        ))
+        self._inflight[cache_key] = task
+        try:
+            return await task
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _generate_uncached(
+        self,
+        cache_key: tuple,
+        keywords: str,
+        content_type_id: str,
+        framework: str,
+        audience_id: str,
+        tone_id: str,
+        additional_context: str,
+        preferred_provider: Optional[str],
+        word_count: str,
+        custom_audience: Optional[Dict],
+        custom_tone: Optional[Dict],
+        custom_content_type: Optional[Dict],
+        custom_framework: Optional[Dict]
+    ) -> RouterResult:
+        """Cache-miss path: resolve options, call the router, store the result."""
+        opts = self._resolve_options(
+            content_type_id, framework, audience_id, tone_id,
+            custom_audience, custom_tone, custom_content_type, custom_framework
+        )
+        audience, tone = opts.audience, opts.tone
+        content_type, framework = opts.content_type, opts.framework
+
+        # Build detailed audience/tone descriptions (cached when id-based)
+        if opts.audience_is_custom:
+            audience_desc = _format_audience_desc(audience)
+        else:
+            audience_desc = _audience_desc_by_id(audience_id)
+
+        if opts.tone_is_custom:
+            tone_desc = _format_tone_desc(tone)
+        else:
+            tone_desc = _tone_desc_by_id(tone_id)
+
+        # Build prompt (the Instagram hashtag request is part of the cached
+        # scaffold tail when applicable)
+        prompt = _build_prompt_cached(
+            keywords=keywords,
+            audience=audience_desc,
+            tone=tone_desc,
+            content_type=content_type.name,
+            framework=framework,
+            additional_context=additional_context,
+            word_count=word_count,
+            hashtag_suffix=content_type_id == "instagram_caption"
+        )
+
+        # Generate
+        result = await self.router.generate(
+            prompt=prompt,
+            system_prompt=PromptTemplates.SYSTEM_PROMPT,
+            preferred_provider=preferred_provider
+        )
+        
+        # Add to history
+        self.add_to_history(
+            keywords=keywords,
+            content_type=content_type.name,
+            framework=framework,
+            audience=audience.name,
+            tone=tone.name,
+            result=result,
+            word_count=word_count
+        )
+
+        if result.success:
+            self._response_cache[cache_key] = (result, time.monotonic())
+            if len(self._response_cache) > _RESPONSE_CACHE_MAX:
+                self._response_cache.popitem(last=False)
+
+        return result
+
+    def update_api_keys(self):
+        """Re-read API keys from settings without rebuilding the generator.
+
+        The router swaps its provider objects in place, so the warm HTTP
+        connections, the response cache and the in-memory history all
+        survive key rotation.
+        """
+        self.router.reload_providers()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response cache counters for the /api/cache/stats endpoint."""
+        total = self._cache_hits + self._cache_misses
+        return {
+            "entries": len(self._response_cache),
+            "max_entries": _RESPONSE_CACHE_MAX,
+            "ttl_seconds": _RESPONSE_CACHE_TTL,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": round(self._cache_hits / total, 4) if total else 0.0,
+        }
+    
+    async def generate_stream(
+        self,
+        keywords: str,
+        content_type_id: str,
+        framework: str,
+        audience_id: str,
+        tone_id: str,
+        additional_context: str = "",
+        preferred_provider: Optional[str] = None,
+        word_count: str = "normal",
+        custom_audience: Optional[Dict] = None,
+        custom_tone: Optional[Dict] = None,
+        custom_content_type: Optional[Dict] = None,
+        custom_framework: Optional[Dict] = None
+    ) -> AsyncGenerator[str, None]:
+        """Generate content with streaming, with support for custom options."""
+
+        opts = self._resolve_options(
+            content_type_id, framework, audience_id, tone_id,
+            custom_audience, custom_tone, custom_content_type, custom_framework
+        )
+        audience, tone = opts.audience, opts.tone
+        content_type, framework = opts.content_type, opts.framework
+
+        # Build descriptions (cached when id-based)
+        if opts.audience_is_custom:
+            audience_desc = _format_audience_brief(audience)
+        else:
+            audience_desc = _audience_brief_by_id(audience_id)
+
+        if opts.tone_is_custom:
+            tone_desc = _format_tone_brief(tone)
+        else:
+            tone_desc = _tone_brief_by_id(tone_id)
+
+        # Build prompt (hashtag suffix baked into the cached scaffold)
+        prompt = _build_prompt_cached(
+            keywords=keywords,
+            audience=audience_desc,
+            tone=tone_desc,
+            content_type=content_type.name,
+            framework=framework,
+            additional_context=additional_context,
+            word_count=word_count,
+            hashtag_suffix=content_type_id == "instagram_caption"
+        )
+
+        # Stream generate (chunks are micro-batched before reaching the UI);
+        # aggregate into one growable buffer instead of a list of fragments.
+        # Past the cap only a rolling tail is kept, so history stays O(1)
+        # regardless of output length.
+        buf = io.StringIO()
+        tail: Optional[deque] = None
+        async for chunk in _coalesce(self.router.generate_with_stream(
+            prompt=prompt,
+            system_prompt=PromptTemplates.SYSTEM_PROMPT,
+            preferred_provider=preferred_provider
+        )):
+            if tail is None:
+                buf.write(chunk)
+                if buf.tell() > _STREAM_HISTORY_CAP:
+                    tail = deque(maxlen=_STREAM_TAIL_CHARS)
+            else:
+                tail.extend(chunk)
+            yield chunk
+
+        # Save to history after streaming completes (excerpted when oversized)
+        if tail is None:
+            content = buf.getvalue()
+        else:
+            content = (buf.getvalue()[:_STREAM_HEAD_CHARS]
+                       + "...[truncated]..." + "".join(tail))
+        if content and not content.startswith("[Error"):
+            # Direct entry: no RouterResult (plus errors list) built per
+            # stream just to be unpacked again by add_to_history
+            self._append_entry(HistoryEntry(
+                timestamp=time.time(),
+                keywords=keywords,
+                content_type=content_type.name,
+                framework=framework,
+                audience=audience.name,
+                tone=tone.name,
+                content=content,
+                provider="streaming",
+                success=True,
+                tokens=None,
+                word_count=word_count
+            ))
+    
+    def get_options(self) -> Dict[str, Any]:
+        """Get all available options for UI."""
+        return {
+            **self._static_options,
+            "providers": self.router.get_available_providers()
+        }
+    
+    def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get provider status for UI (memoized per request context)."""
+        status = _STATUS_CACHE.get()
+        if status is None:
+            status = self.router.get_provider_status()
+            _STATUS_CACHE.set(status)
+        return status
+    
+    def get_usage_stats(self) -> Dict[str, Dict]:
+        """Get usage statistics."""
+        return self.router.get_usage_stats()
+    
+    async def generate_from_prompt(
+        self,
+        prompt: str,
+        preferred_provider: Optional[str] = None,
+        max_tokens: int = 2000
+    ) -> RouterResult:
+        """Generate content from a custom prompt."""
+        result = await self.router.generate(
+            prompt=prompt,
+            system_prompt=PromptTemplates.SYSTEM_PROMPT,
+            preferred_provider=preferred_provider,
+            max_tokens=max_tokens
+        )
+        return result
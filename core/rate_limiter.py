@@ -6,7 +6,33 @@ from dataclasses import dataclass, field
 from collections import defaultdict
 
 
-@dataclass
+# Default client-side budget: 10 requests/minute, i.e. one token every 6s,
+# with bursts up to the full bucket.
+_DEFAULT_BUCKET_CAPACITY = 10.0
+_DEFAULT_REFILL_RATE = 10.0 / 60.0  # tokens per second
+
+# Adaptive pacing: each provider rejection halves the refill rate
+# (multiplicative decrease), each success restores a slice of the base rate
+# (additive increase), so sustained 429s converge on the provider's real
+# budget instead of hammering it with retries.
+_ATB_BACKOFF = 0.5
+_ATB_RECOVERY = 0.1  # fraction of the base rate regained per success
+_ATB_MIN_RATE = 1.0 / 60.0  # never slower than one request per minute
+
+# Known rate-limit headers -> RateLimitInfo attribute, matched after one
+# lowercase per key (generic OpenAI-style plus Groq's -requests variants).
+_HEADER_ATTRS = {
+    "x-ratelimit-remaining": "requests_remaining",
+    "x-ratelimit-limit": "requests_limit",
+    "x-ratelimit-remaining-requests": "requests_remaining",
+    "x-ratelimit-limit-requests": "requests_limit",
+}
+# Reset headers carry either an absolute epoch or relative seconds
+_RESET_ABSOLUTE = "x-ratelimit-reset"
+_RESET_RELATIVE = "x-ratelimit-reset-requests"
+
+
+@dataclass(slots=True)
 class RateLimitInfo:
     """Rate limit information for a provider."""
     requests_remaining: int = 100
@@ -16,7 +42,14 @@ class RateLimitInfo:
     reset_time: Optional[float] = None
     last_request_time: float = field(default_factory=time.time)
     request_count: int = 0
-    
+    # Lazy-refill token bucket for client-side pacing; refill_rate adapts
+    # between _ATB_MIN_RATE and base_refill_rate as the provider pushes back
+    bucket_tokens: float = _DEFAULT_BUCKET_CAPACITY
+    bucket_capacity: float = _DEFAULT_BUCKET_CAPACITY
+    refill_rate: float = _DEFAULT_REFILL_RATE
+    base_refill_rate: float = _DEFAULT_REFILL_RATE
+    last_refill: float = field(default_factory=time.monotonic)
+
     def is_rate_limited(self) -> bool:
         """Check if currently rate limited."""
         if self.reset_time and time.time() < self.reset_time:
@@ -24,7 +57,7 @@ class RateLimitInfo:
         if self.requests_remaining <= 0:
             return True
         return False
-    
+
     def time_until_reset(self) -> float:
         """Get seconds until rate limit resets."""
         if not self.reset_time:
@@ -35,11 +68,18 @@ class RateLimitInfo:
 class RateLimiter:
     """Manages rate limits across multiple providers."""
     
-    def __init__(self):
+    def __init__(self, providers: tuple = ()):
         self._limits: Dict[str, RateLimitInfo] = defaultdict(RateLimitInfo)
-        self._semaphores: Dict[str, asyncio.Semaphore] = {}
-        self._default_max_requests = 10  # requests per minute default
-        self._default_min_interval = 6.0  # seconds between requests
+        self._default_max_concurrent = 8  # concurrent in-flight requests default
+        # Known providers get their semaphore up front; concurrency_slot then
+        # skips the creation branch (and any create-twice race) entirely
+        self._semaphores: Dict[str, asyncio.BoundedSemaphore] = {
+            name: asyncio.BoundedSemaphore(self._default_max_concurrent)
+            for name in providers
+        }
+        # Per-provider events armed when a server-imposed limit is known;
+        # waiters get one precise wake-up instead of polling
+        self._reset_events: Dict[str, asyncio.Event] = {}
     
     def get_limit_info(self, provider_name: str) -> RateLimitInfo:
         """Get rate limit info for a provider."""
@@ -50,34 +90,59 @@ class RateLimiter:
         provider_name: str,
         headers: Dict[str, str]
     ):
-        """Update rate limits from HTTP response headers."""
+        """Update rate limits from HTTP response headers.
+
+        One pass over the headers with lowercased keys and a dispatch table
+        instead of a dozen membership probes; also tolerates mixed-case
+        header names as delivered by httpx/requests.
+        """
         info = self._limits[provider_name]
-        
-        # Common header patterns
-        if "x-ratelimit-remaining" in headers:
-            info.requests_remaining = int(headers["x-ratelimit-remaining"])
-        if "x-ratelimit-limit" in headers:
-            info.requests_limit = int(headers["x-ratelimit-limit"])
-        if "x-ratelimit-reset" in headers:
-            info.reset_time = float(headers["x-ratelimit-reset"])
-        
-        # Groq specific
-        if "x-ratelimit-remaining-requests" in headers:
-            info.requests_remaining = int(headers["x-ratelimit-remaining-requests"])
-        if "x-ratelimit-limit-requests" in headers:
-            info.requests_limit = int(headers["x-ratelimit-limit-requests"])
-        if "x-ratelimit-reset-requests" in headers:
-            info.reset_time = time.time() + int(headers["x-ratelimit-reset-requests"])
-        
+
+        for key, value in headers.items():
+            key = key.lower()
+            attr = _HEADER_ATTRS.get(key)
+            if attr:
+                setattr(info, attr, int(value))
+            elif key == _RESET_ABSOLUTE:
+                info.reset_time = float(value)
+            elif key == _RESET_RELATIVE:
+                info.reset_time = time.time() + int(value)
+
         info.last_request_time = time.time()
         info.request_count += 1
     
+    def _schedule_reset(self, provider_name: str, delay: float):
+        """Arm the provider's reset event for one precise wake-up."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop: acquire falls back to timed sleeps
+        event = self._reset_events.get(provider_name)
+        if event is None:
+            event = asyncio.Event()
+            self._reset_events[provider_name] = event
+        event.clear()
+        loop.call_later(delay, event.set)
+
     def set_rate_limited(self, provider_name: str, reset_after: Optional[float] = None):
         """Mark a provider as rate limited."""
         info = self._limits[provider_name]
         info.requests_remaining = 0
+        # Multiplicative decrease: the provider rejected us, so halve the
+        # client-side pace until successes earn it back
+        info.refill_rate = max(_ATB_MIN_RATE, info.refill_rate * _ATB_BACKOFF)
         if reset_after:
             info.reset_time = time.time() + reset_after
+            self._schedule_reset(provider_name, reset_after)
+
+    def record_success(self, provider_name: str):
+        """Additive recovery toward the base pace after a successful call."""
+        info = self._limits[provider_name]
+        if info.refill_rate < info.base_refill_rate:
+            info.refill_rate = min(
+                info.base_refill_rate,
+                info.refill_rate + info.base_refill_rate * _ATB_RECOVERY
+            )
     
     def is_rate_limited(self, provider_name: str) -> bool:
         """Check if a provider is currently rate limited."""
@@ -87,49 +152,77 @@ class RateLimiter:
         """Get seconds until provider is available again."""
         return self._limits[provider_name].time_until_reset()
     
-    async def acquire(self, provider_name: str):
-        """Acquire permission to make a request."""
-        # Initialize semaphore if needed
-        if provider_name not in self._semaphores:
-            self._semaphores[provider_name] = asyncio.Semaphore(self._default_max_requests)
-        
-        semaphore = self._semaphores[provider_name]
+    def try_acquire(self, provider_name: str) -> Tuple[bool, float]:
+        """Try to admit a request without waiting.
+
+        Lazily refills the provider's token bucket and consumes one token if
+        available. Returns (admitted, seconds_until_next_token) so callers
+        get the rate-limit check, remaining-wait query and slot acquisition
+        in a single call.
+        """
         info = self._limits[provider_name]
-        
-        # Wait if rate limited
-        while self.is_rate_limited(provider_name):
-            wait_time = self.time_until_available(provider_name)
-            if wait_time > 0:
-                await asyncio.sleep(min(wait_time, 60))  # Max 60 second wait
-            else:
-                # Reset if no specific reset time
-                info.requests_remaining = info.requests_limit
-                info.reset_time = None
+
+        # Server-imposed limit (from headers/429) takes precedence
+        if info.reset_time:
+            remaining = info.reset_time - time.time()
+            if remaining > 0:
+                return False, remaining
+            info.reset_time = None
+            info.requests_remaining = info.requests_limit
+
+        now = time.monotonic()
+        tokens = min(
+            info.bucket_capacity,
+            info.bucket_tokens + (now - info.last_refill) * info.refill_rate
+        )
+        info.last_refill = now
+
+        if tokens >= 1.0:
+            info.bucket_tokens = tokens - 1.0
+            info.last_request_time = time.time()
+            return True, 0.0
+
+        info.bucket_tokens = tokens
+        return False, (1.0 - tokens) / info.refill_rate
+
+    async def acquire(self, provider_name: str):
+        """Acquire permission to make a request, waiting for a token.
+
+        Only handles request-rate pacing; concurrent in-flight capping is a
+        separate concern served by concurrency_slot(). Server-imposed limits
+        wait on the armed reset event (one precise wake-up); client-side
+        pacing sleeps exactly one refill gap.
+        """
+        while True:
+            admitted, wait_time = self.try_acquire(provider_name)
+            if admitted:
                 break
-        
-        # Acquire semaphore with timeout
-        try:
-            await asyncio.wait_for(
-                semaphore.acquire(),
-                timeout=30.0
+            event = self._reset_events.get(provider_name)
+            if event is not None and not event.is_set():
+                await event.wait()
+                continue
+            await asyncio.sleep(min(wait_time, 60))  # Max 60 second wait
+
+    def concurrency_slot(self, provider_name: str) -> asyncio.BoundedSemaphore:
+        """Per-provider cap on concurrent in-flight requests.
+
+        Returns a BoundedSemaphore for use as `async with
+        limiter.concurrency_slot(name):`. Orthogonal to the token bucket -
+        rate governs admission over time, this bounds simultaneous calls, so
+        bursts within budget are no longer serialized.
+        """
+        sem = self._semaphores.get(provider_name)
+        if sem is None:
+            # Unknown name: creation is atomic on the loop thread (no await
+            # between the probe and the store), so two waiters cannot end up
+            # with different semaphores
+            sem = self._semaphores.setdefault(
+                provider_name,
+                asyncio.BoundedSemaphore(self._default_max_concurrent)
             )
-        except asyncio.TimeoutError:
-            raise Exception(f"Could not acquire rate limit slot for {provider_name}")
-        
-        # Enforce minimum interval between requests
-        time_since_last = time.time() - info.last_request_time
-        if time_since_last < self._default_min_interval:
-            await asyncio.sleep(self._default_min_interval - time_since_last)
-    
-    def release(self, provider_name: str):
-        """Release a request slot."""
-        if provider_name in self._semaphores:
-            try:
-                self._semaphores[provider_name].release()
-            except ValueError:
-                # Semaphore was already at max value
-                pass
-    
+        return sem
+
+
     async def __aenter__(self):
         """Async context manager entry."""
         return self
@@ -139,37 +232,64 @@ class RateLimiter:
         pass
 
 
+_SECONDS_IN_DAY = 86400.0
+
+
 class QuotaManager:
     """Manages usage quotas across providers."""
-    
+
     def __init__(self):
-        self._daily_usage: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._last_reset: float = time.time()
-    
+        # Flat storage: [requests, tokens] per provider - one hash probe and
+        # two direct index bumps per record_usage, no nested factories
+        self._daily_usage: Dict[str, list] = {}
+        self._next_reset: float = time.monotonic() + _SECONDS_IN_DAY
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._arm_timer()
+
+    def _arm_timer(self):
+        """Schedule the daily reset once instead of checking per call."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._timer = None  # no loop: fall back to the lazy check
+            return
+        self._timer = loop.call_later(_SECONDS_IN_DAY, self._reset)
+
+    def _reset(self):
+        """Clear daily usage and re-arm the timer."""
+        self._daily_usage.clear()
+        self._next_reset = time.monotonic() + _SECONDS_IN_DAY
+        self._arm_timer()
+
     def _check_reset(self):
-        """Check if daily quotas should be reset."""
-        current_time = time.time()
-        seconds_in_day = 24 * 60 * 60
-        
-        if current_time - self._last_reset > seconds_in_day:
-            self._daily_usage.clear()
-            self._last_reset = current_time
+        """Lazy fallback for callers outside a running event loop."""
+        if self._timer is None and time.monotonic() >= self._next_reset:
+            self._reset()
     
     def record_usage(self, provider_name: str, tokens: int = 0):
         """Record usage for a provider."""
         self._check_reset()
-        self._daily_usage[provider_name]["requests"] += 1
-        self._daily_usage[provider_name]["tokens"] += tokens
-    
+        usage = self._daily_usage.get(provider_name)
+        if usage is None:
+            usage = self._daily_usage[provider_name] = [0, 0]
+        usage[0] += 1
+        usage[1] += tokens
+
     def get_usage(self, provider_name: str) -> Dict[str, int]:
         """Get usage statistics for a provider."""
         self._check_reset()
-        return dict(self._daily_usage[provider_name])
-    
+        usage = self._daily_usage.get(provider_name)
+        if usage is None:
+            return {}
+        return {"requests": usage[0], "tokens": usage[1]}
+
     def get_all_usage(self) -> Dict[str, Dict[str, int]]:
         """Get usage for all providers."""
         self._check_reset()
-        return {k: dict(v) for k, v in self._daily_usage.items()}
+        return {
+            k: {"requests": v[0], "tokens": v[1]}
+            for k, v in self._daily_usage.items()
+        }
     
     def estimate_cost(self, provider_name: str, tokens: int) -> float:
         """Estimate cost for tokens (rough estimates)."""
@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import asyncio
+import threading
 from typing import Dict, Any, Optional
 from flask import Flask, request, jsonify, render_template_string
 from flask_cors import CORS
@@ -25,6 +26,19 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for cross-origin requests
 
+# One persistent event loop on a background thread: the providers' pooled
+# HTTP connections are bound to the loop that first used them, so every
+# request (and every waitress worker thread) must await on this same loop
+# instead of creating and closing its own
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True, name="aio-loop").start()
+
+
+def _run_async(coro):
+    """Run a coroutine on the persistent background loop and wait for it."""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
 # Initialize the content generator
 generator = ContentGenerator()
 
@@ -284,11 +298,8 @@ def extend_content():
         else:
             prompt = build_detailed_expansion_prompt(initial_content, expansion_focus)
         
-        # Use the content generator to extend the content
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        result_obj = loop.run_until_complete(
+        # Use the content generator to extend the content, on the shared loop
+        result_obj = _run_async(
             generator.generate_from_prompt(prompt, preferred_provider=None)
         )
         
@@ -331,4 +342,9 @@ if __name__ == '__main__':
     print("Access the service at: http://localhost:5001")
     print("API endpoint: POST /api/extend")
     
-    app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
\ No newline at end of file
+    # Production WSGI server, with the Werkzeug dev server as fallback
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5001, threads=8)
+    except ImportError:
+        app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
\ No newline at end of file
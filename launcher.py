@@ -1,6 +1,7 @@
 """CopySpell AI - Launcher pentru executabil"""
 import os
 import sys
+import urllib.request
 import webbrowser
 import threading
 import time
@@ -16,12 +17,17 @@ else:
 
 sys.path.insert(0, base_path)
 
-# Verifica update-uri la pornire
-try:
-    from updater import check_and_update
-    check_and_update()
-except Exception as e:
-    print(f"Nu s-a putut verifica update-ul: {e}")
+# Verifica update-uri la pornire, in fundal - serverul porneste imediat,
+# fara sa astepte round-trip-ul HTTP al updater-ului
+def _safe_check_and_update():
+    try:
+        from updater import check_and_update
+        check_and_update()
+    except Exception as e:
+        print(f"Nu s-a putut verifica update-ul: {e}")
+
+
+threading.Thread(target=_safe_check_and_update, daemon=True).start()
 
 # Nu setăm API keys în launcher pentru a evita blocarea de către GitHub
 # API keys sunt gestionate separat în fișiere de configurare
@@ -29,8 +35,14 @@ except Exception as e:
 from web_app import app
 
 def open_browser():
-    """Deschide browserul automat dupa 2 secunde"""
-    time.sleep(2)
+    """Deschide browserul imediat ce serverul raspunde (fara sleep fix)"""
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen('http://127.0.0.1:5000/', timeout=0.5)
+            break
+        except Exception:
+            time.sleep(0.1)
     webbrowser.open('http://127.0.0.1:5000')
 
 def start_extension_service():
@@ -38,7 +50,11 @@ def start_extension_service():
     try:
         from extension_service import app as extension_app
         print("Starting extension service on port 5001...")
-        extension_app.run(host='127.0.0.1', port=5001, debug=False, use_reloader=False, threaded=True)
+        try:
+            from waitress import serve
+            serve(extension_app, host='127.0.0.1', port=5001, threads=8)
+        except ImportError:
+            extension_app.run(host='127.0.0.1', port=5001, debug=False, use_reloader=False, threaded=True)
     except Exception as e:
         print(f"Error starting extension service: {e}")
 
@@ -65,12 +81,18 @@ def main():
     extension_thread = threading.Thread(target=start_extension_service, daemon=True)
     extension_thread.start()
     
-    # Start browser after a brief delay
-    time.sleep(2)
-    webbrowser.open('http://127.0.0.1:5000')
-    
-    # Start the main Flask app
-    app.run(host='127.0.0.1', port=5000, debug=False)
+    # Start browser as soon as the server answers
+    threading.Thread(target=open_browser, daemon=True).start()
+
+    # Start the main Flask app pe un server WSGI threaded de productie;
+    # dev-serverul Werkzeug ramane fallback daca waitress lipseste.
+    # Thread-urile doar asteapta dupa loop-ul async partajat cat dureaza
+    # apelul LLM, deci 16 in-flight simultan e ieftin
+    try:
+        from waitress import serve
+        serve(app, host='127.0.0.1', port=5000, threads=16)
+    except ImportError:
+        app.run(host='127.0.0.1', port=5000, debug=False, threaded=True)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
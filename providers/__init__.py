@@ -1,6 +1,21 @@
+import importlib
+
 from .base import BaseAIProvider
-from .deepseek import DeepSeekProvider
-from .groq import GroqProvider
-from .openrouter import OpenRouterProvider
+
+# Provider classes resolve lazily (PEP 562), so `from providers import
+# BaseAIProvider` no longer executes all three provider modules; the router
+# imports each one only when its API key is configured.
+_PROVIDER_MODULES = {
+    "DeepSeekProvider": ".deepseek",
+    "GroqProvider": ".groq",
+    "OpenRouterProvider": ".openrouter",
+}
 
 __all__ = ["BaseAIProvider", "DeepSeekProvider", "GroqProvider", "OpenRouterProvider"]
+
+
+def __getattr__(name: str):
+    module_name = _PROVIDER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
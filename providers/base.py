@@ -1,9 +1,83 @@
 """Base class for AI providers."""
+import asyncio
+import random
+import re
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, AsyncGenerator
 from dataclasses import dataclass
 from enum import Enum
 
+import httpx
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:  # degrade gracefully to stdlib json
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+
+# Backoff schedule for transient request failures (429 / 5xx / connect)
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 15.0
+
+# Rough tokenizer-free estimate for the pre-flight size check: ~4 chars per
+# token holds (as an underestimate of tokens) for these chat models
+_CHARS_PER_TOKEN = 4
+
+
+# OpenAI-format SSE chunks carry one delta each; the content string can be
+# pulled out with a regex (escape-pair aware, so embedded \" cannot end the
+# match early) instead of materializing the whole chunk dict per token.
+_DELTA_CONTENT_RE = re.compile(r'"content":"((?:[^"\\]|\\.)*)"')
+
+
+def _sse_delta_content(data_str: str) -> Optional[str]:
+    """Fast-path extraction of choices[0].delta.content from an SSE line.
+
+    Returns the delta text, or None when the line does not match (role /
+    finish chunks, unexpected shapes) and the caller should fall back to a
+    full JSON parse.
+    """
+    m = _DELTA_CONTENT_RE.search(data_str)
+    if m is None:
+        return None
+    raw = m.group(1)
+    if "\\" in raw:
+        # Only chunks with escapes pay for a JSON string decode
+        return _json_loads('"' + raw + '"')
+    return raw
+
+
+async def _iter_sse_data(response) -> AsyncGenerator[str, None]:
+    """Yield the payload of each SSE `data:` line, up to the [DONE] marker.
+
+    Iterates the raw byte stream and splits lines manually instead of going
+    through aiter_lines(), which decodes and line-scans the whole stream:
+    here only the data payloads ever become Python strings.
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        while (nl := buf.find(b"\n")) != -1:
+            line = bytes(buf[:nl])
+            del buf[:nl + 1]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line.startswith(b"data: "):
+                payload = line[6:]
+                if payload == b"[DONE]":
+                    return
+                yield payload.decode("utf-8")
+
 
 class ProviderStatus(Enum):
     """Provider status."""
@@ -13,7 +87,7 @@ class ProviderStatus(Enum):
     DISABLED = "disabled"
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result from content generation."""
     success: bool
@@ -25,7 +99,7 @@ class GenerationResult:
     raw_response: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for an AI provider."""
     name: str
@@ -39,13 +113,113 @@ class ProviderConfig:
 
 class BaseAIProvider(ABC):
     """Abstract base class for AI providers."""
-    
-    def __init__(self, config: ProviderConfig):
+
+    # Approximate context windows (tokens) per model, used to fail oversized
+    # prompts locally instead of paying a doomed round-trip; subclasses fill
+    # this in, unknown models use the conservative default
+    MODEL_CONTEXT: Dict[str, int] = {}
+    DEFAULT_CONTEXT = 32768
+
+    def __init__(self, config: ProviderConfig, session: Optional[httpx.AsyncClient] = None):
         self.config = config
         self.status = ProviderStatus.AVAILABLE if config.api_key else ProviderStatus.DISABLED
         self.last_error: Optional[str] = None
         self.rate_limit_reset: Optional[float] = None
-    
+        # Shared HTTP client injected by the router; providers fall back to a
+        # lazily created own client when used standalone
+        self._session = session
+        self._owns_session = False
+
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client - connections and TLS handshakes are reused
+        across requests instead of rebuilt per call."""
+        if self._session is None or self._session.is_closed:
+            client_kwargs = dict(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60
+                )
+            )
+            try:
+                self._session = httpx.AsyncClient(http2=True, **client_kwargs)
+            except ImportError:  # h2 not installed: HTTP/1.1 still works
+                self._session = httpx.AsyncClient(**client_kwargs)
+            self._owns_session = True
+        return self._session
+
+    def _prompt_too_large(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model_name: str,
+        max_tokens: int
+    ) -> bool:
+        """Pre-flight size check against the model's context window."""
+        limit = self.MODEL_CONTEXT.get(model_name, self.DEFAULT_CONTEXT)
+        approx = (len(prompt) + len(system_prompt or "")) // _CHARS_PER_TOKEN
+        return approx + max_tokens > limit
+
+    async def _post_with_retries(
+        self,
+        url: str,
+        content: bytes,
+        headers: Dict[str, str],
+        max_retries: int = 3
+    ) -> httpx.Response:
+        """POST with exponential backoff + jitter on transient failures.
+
+        Retries 429 (honoring Retry-After when present), 5xx responses and
+        connection errors, so short rate-limit windows become pauses instead
+        of user-visible failures. Total sleep is capped by config.timeout;
+        the last response (or connection error) is handed back to the
+        caller's existing status handling.
+        """
+        budget = float(self.config.timeout)
+        slept = 0.0
+        response = None
+        last_exc: Optional[Exception] = None
+        for attempt in range(max_retries):
+            try:
+                response = await self._http().post(url, content=content, headers=headers)
+                last_exc = None
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                response = None
+                last_exc = e
+            if response is not None and response.status_code != 429 \
+                    and response.status_code < 500:
+                return response
+            if attempt == max_retries - 1:
+                break
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * (2 ** attempt)) \
+                + random.uniform(0, _RETRY_BASE_DELAY)
+            if response is not None and response.status_code == 429:
+                retry_after = response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = float(retry_after) + random.uniform(0, 1.0)
+                    except ValueError:
+                        pass
+            if slept + delay > budget:
+                break
+            await asyncio.sleep(delay)
+            slept += delay
+        if response is None and last_exc is not None:
+            raise last_exc
+        return response
+
+    async def aclose(self):
+        """Close the provider's own HTTP client at shutdown.
+
+        Router-injected sessions are shared across providers and stay open;
+        they are closed once by AIRouter.close().
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.aclose()
+            self._session = None
+            self._owns_session = False
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
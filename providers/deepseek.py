@@ -1,9 +1,9 @@
 """DeepSeek provider implementation."""
-import json
 from typing import Optional, AsyncGenerator
 import httpx
 
-from .base import BaseAIProvider, ProviderConfig, GenerationResult
+from .base import (BaseAIProvider, ProviderConfig, GenerationResult,
+                   _json_dumps, _json_loads, _iter_sse_data, _sse_delta_content)
 
 
 class DeepSeekProvider(BaseAIProvider):
@@ -16,7 +16,12 @@ class DeepSeekProvider(BaseAIProvider):
         "deepseek-reasoner",
     ]
     
-    def __init__(self, api_key: Optional[str]):
+    MODEL_CONTEXT = {
+        "deepseek-chat": 65536,
+        "deepseek-reasoner": 65536,
+    }
+    
+    def __init__(self, api_key: Optional[str], session: Optional[httpx.AsyncClient] = None):
         config = ProviderConfig(
             name="deepseek",
             api_key=api_key,
@@ -25,7 +30,14 @@ class DeepSeekProvider(BaseAIProvider):
             max_tokens=2048,
             temperature=0.7
         )
-        super().__init__(config)
+        super().__init__(config, session)
+        # Static per-instance request bits, built once instead of per call
+        self._chat_url = f"{self.API_BASE}/chat/completions"
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.config.api_key}"
+        }
+        self._auth_headers = {"Authorization": f"Bearer {self.config.api_key}"}
     
     @property
     def provider_name(self) -> str:
@@ -57,7 +69,15 @@ class DeepSeekProvider(BaseAIProvider):
         temp = self._get_temperature(temperature)
         max_tok = self._get_max_tokens(max_tokens)
         
-        url = f"{self.API_BASE}/chat/completions"
+        if self._prompt_too_large(prompt, system_prompt, model_name, max_tok):
+            # Doomed request: fail locally instead of a full round-trip
+            return GenerationResult(
+                success=False,
+                content="",
+                provider=self.provider_name,
+                model=model_name,
+                error_message="Prompt too large for model context"
+            )
         
         messages = []
         if system_prompt:
@@ -73,53 +93,45 @@ class DeepSeekProvider(BaseAIProvider):
             "stream": False
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.config.api_key}"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=headers
+            response = await self._post_with_retries(
+                self._chat_url, _json_dumps(payload), self._base_headers
+            )
+
+            if response.status_code == 429:
+                self.set_rate_limited()
+                return GenerationResult(
+                    success=False,
+                    content="",
+                    provider=self.provider_name,
+                    model=model_name,
+                    error_message="Rate limit exceeded"
                 )
                 
-                if response.status_code == 429:
-                    self.set_rate_limited()
-                    return GenerationResult(
-                        success=False,
-                        content="",
-                        provider=self.provider_name,
-                        model=model_name,
-                        error_message="Rate limit exceeded"
-                    )
-                
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = _json_loads(response.content)
                 
-                if "choices" in data and len(data["choices"]) > 0:
-                    content = data["choices"][0]["message"]["content"]
-                    tokens_used = data.get("usage", {}).get("total_tokens")
+            if "choices" in data and len(data["choices"]) > 0:
+                content = data["choices"][0]["message"]["content"]
+                tokens_used = data.get("usage", {}).get("total_tokens")
                     
-                    return GenerationResult(
-                        success=True,
-                        content=content,
-                        provider=self.provider_name,
-                        model=model_name,
-                        tokens_used=tokens_used,
-                        raw_response=data
-                    )
-                
                 return GenerationResult(
-                    success=False,
-                    content="",
+                    success=True,
+                    content=content,
                     provider=self.provider_name,
                     model=model_name,
-                    error_message="No content in response"
+                    tokens_used=tokens_used,
+                    raw_response=data
                 )
                 
+            return GenerationResult(
+                success=False,
+                content="",
+                provider=self.provider_name,
+                model=model_name,
+                error_message="No content in response"
+            )
+                
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP error: {e.response.status_code}"
             if e.response.status_code == 429:
@@ -161,8 +173,6 @@ class DeepSeekProvider(BaseAIProvider):
         temp = self._get_temperature(temperature)
         max_tok = self._get_max_tokens(max_tokens)
         
-        url = f"{self.API_BASE}/chat/completions"
-        
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -177,47 +187,43 @@ class DeepSeekProvider(BaseAIProvider):
             "stream": True
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.config.api_key}"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status_code == 429:
-                        self.set_rate_limited()
-                        yield "[Rate limit exceeded]"
-                        return
+            client = self._http()
+            async with client.stream(
+                "POST",
+                self._chat_url,
+                content=_json_dumps(payload),
+                headers=self._base_headers
+            ) as response:
+                if response.status_code == 429:
+                    self.set_rate_limited()
+                    yield "[Rate limit exceeded]"
+                    return
                     
-                    if response.status_code == 401:
-                        yield "[Invalid API key]"
-                        return
+                if response.status_code == 401:
+                    yield "[Invalid API key]"
+                    return
                     
-                    if response.status_code == 402:
-                        yield "[Insufficient balance]"
-                        return
+                if response.status_code == 402:
+                    yield "[Insufficient balance]"
+                    return
                     
-                    response.raise_for_status()
+                response.raise_for_status()
                     
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                break
-                            try:
-                                data = json.loads(data_str)
-                                if "choices" in data and len(data["choices"]) > 0:
-                                    delta = data["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        yield delta["content"]
-                            except json.JSONDecodeError:
-                                continue
+                async for data_str in _iter_sse_data(response):
+                    text = _sse_delta_content(data_str)
+                    if text is not None:
+                        yield text
+                        continue
+                    # Fallback: role/finish chunks or unexpected shapes
+                    try:
+                        data = _json_loads(data_str)
+                        if "choices" in data and len(data["choices"]) > 0:
+                            delta = data["choices"][0].get("delta", {})
+                            if "content" in delta:
+                                yield delta["content"]
+                    except ValueError:
+                        continue
         except Exception as e:
             yield f"[Error: {str(e)}]"
     
@@ -229,10 +235,12 @@ class DeepSeekProvider(BaseAIProvider):
         try:
             # Simple check by listing models
             url = f"{self.API_BASE}/models"
-            headers = {"Authorization": f"Bearer {self.config.api_key}"}
-            
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, headers=headers)
+            client = self._http()
+            # Status-only probe: the body (e.g. the full model list) is
+            # never downloaded
+            async with client.stream(
+                "GET", url, headers=self._auth_headers, timeout=10
+            ) as response:
                 return response.status_code == 200
         except:
             return False
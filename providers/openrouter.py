@@ -1,9 +1,9 @@
 """OpenRouter provider implementation."""
-import json
 from typing import Optional, AsyncGenerator
 import httpx
 
-from .base import BaseAIProvider, ProviderConfig, GenerationResult
+from .base import (BaseAIProvider, ProviderConfig, GenerationResult,
+                   _json_dumps, _json_loads, _iter_sse_data, _sse_delta_content)
 
 
 class OpenRouterProvider(BaseAIProvider):
@@ -19,7 +19,15 @@ class OpenRouterProvider(BaseAIProvider):
         "mistralai/mistral-7b-instruct",
     ]
     
-    def __init__(self, api_key: Optional[str]):
+    MODEL_CONTEXT = {
+        "anthropic/claude-3.5-sonnet": 200000,
+        "anthropic/claude-3-haiku": 200000,
+        "meta-llama/llama-3.3-70b-instruct": 131072,
+        "google/gemini-pro-1.5": 1000000,
+        "mistralai/mistral-7b-instruct": 32768,
+    }
+    
+    def __init__(self, api_key: Optional[str], session: Optional[httpx.AsyncClient] = None):
         config = ProviderConfig(
             name="openrouter",
             api_key=api_key,
@@ -28,7 +36,16 @@ class OpenRouterProvider(BaseAIProvider):
             max_tokens=2048,
             temperature=0.7
         )
-        super().__init__(config)
+        super().__init__(config, session)
+        # Static per-instance request bits, built once instead of per call
+        self._chat_url = f"{self.API_BASE}/chat/completions"
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.config.api_key}",
+            "HTTP-Referer": "https://copyspell-ai.app",
+            "X-Title": "CopySpell AI"
+        }
+        self._auth_headers = {"Authorization": f"Bearer {self.config.api_key}"}
     
     @property
     def provider_name(self) -> str:
@@ -60,7 +77,15 @@ class OpenRouterProvider(BaseAIProvider):
         temp = self._get_temperature(temperature)
         max_tok = self._get_max_tokens(max_tokens)
         
-        url = f"{self.API_BASE}/chat/completions"
+        if self._prompt_too_large(prompt, system_prompt, model_name, max_tok):
+            # Doomed request: fail locally instead of a full round-trip
+            return GenerationResult(
+                success=False,
+                content="",
+                provider=self.provider_name,
+                model=model_name,
+                error_message="Prompt too large for model context"
+            )
         
         messages = []
         if system_prompt:
@@ -77,77 +102,67 @@ class OpenRouterProvider(BaseAIProvider):
             "transforms": ["middle-out"]  # OpenRouter feature for context window
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.config.api_key}",
-            "HTTP-Referer": "https://copyspell-ai.app",
-            "X-Title": "CopySpell AI"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=headers
+            response = await self._post_with_retries(
+                self._chat_url, _json_dumps(payload), self._base_headers
+            )
+
+            if response.status_code == 429:
+                error_data = _json_loads(response.content) if response.content else {}
+                retry_after = error_data.get("error", {}).get("metadata", {}).get("retry_after")
+                reset_time = None
+                if retry_after:
+                    import time
+                    reset_time = time.time() + retry_after
+                self.set_rate_limited(reset_time)
+                return GenerationResult(
+                    success=False,
+                    content="",
+                    provider=self.provider_name,
+                    model=model_name,
+                    error_message="Rate limit exceeded"
                 )
                 
-                if response.status_code == 429:
-                    error_data = response.json() if response.text else {}
-                    retry_after = error_data.get("error", {}).get("metadata", {}).get("retry_after")
-                    reset_time = None
-                    if retry_after:
-                        import time
-                        reset_time = time.time() + retry_after
-                    self.set_rate_limited(reset_time)
-                    return GenerationResult(
-                        success=False,
-                        content="",
-                        provider=self.provider_name,
-                        model=model_name,
-                        error_message="Rate limit exceeded"
-                    )
-                
-                # Check for provider-specific errors
-                if response.status_code == 402:
-                    error_data = response.json() if response.text else {}
-                    error_msg = error_data.get("error", {}).get("message", "Insufficient credits")
-                    return GenerationResult(
-                        success=False,
-                        content="",
-                        provider=self.provider_name,
-                        model=model_name,
-                        error_message=error_msg
-                    )
+            # Check for provider-specific errors
+            if response.status_code == 402:
+                error_data = _json_loads(response.content) if response.content else {}
+                error_msg = error_data.get("error", {}).get("message", "Insufficient credits")
+                return GenerationResult(
+                    success=False,
+                    content="",
+                    provider=self.provider_name,
+                    model=model_name,
+                    error_message=error_msg
+                )
                 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = _json_loads(response.content)
                 
-                if "choices" in data and len(data["choices"]) > 0:
-                    content = data["choices"][0]["message"]["content"]
-                    tokens_used = data.get("usage", {}).get("total_tokens")
+            if "choices" in data and len(data["choices"]) > 0:
+                content = data["choices"][0]["message"]["content"]
+                tokens_used = data.get("usage", {}).get("total_tokens")
                     
-                    return GenerationResult(
-                        success=True,
-                        content=content,
-                        provider=self.provider_name,
-                        model=model_name,
-                        tokens_used=tokens_used,
-                        raw_response=data
-                    )
-                
                 return GenerationResult(
-                    success=False,
-                    content="",
+                    success=True,
+                    content=content,
                     provider=self.provider_name,
                     model=model_name,
-                    error_message="No content in response"
+                    tokens_used=tokens_used,
+                    raw_response=data
                 )
                 
+            return GenerationResult(
+                success=False,
+                content="",
+                provider=self.provider_name,
+                model=model_name,
+                error_message="No content in response"
+            )
+                
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP error: {e.response.status_code}"
             try:
-                error_data = e.response.json()
+                error_data = _json_loads(e.response.content)
                 if "error" in error_data:
                     error_msg = error_data["error"].get("message", error_msg)
             except:
@@ -189,8 +204,6 @@ class OpenRouterProvider(BaseAIProvider):
         temp = self._get_temperature(temperature)
         max_tok = self._get_max_tokens(max_tokens)
         
-        url = f"{self.API_BASE}/chat/completions"
-        
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -206,45 +219,39 @@ class OpenRouterProvider(BaseAIProvider):
             "transforms": ["middle-out"]
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.config.api_key}",
-            "HTTP-Referer": "https://copyspell-ai.app",
-            "X-Title": "CopySpell AI"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status_code == 429:
-                        self.set_rate_limited()
-                        yield "[Rate limit exceeded]"
-                        return
+            client = self._http()
+            async with client.stream(
+                "POST",
+                self._chat_url,
+                content=_json_dumps(payload),
+                headers=self._base_headers
+            ) as response:
+                if response.status_code == 429:
+                    self.set_rate_limited()
+                    yield "[Rate limit exceeded]"
+                    return
                     
-                    if response.status_code == 402:
-                        yield "[Insufficient credits]"
-                        return
+                if response.status_code == 402:
+                    yield "[Insufficient credits]"
+                    return
                     
-                    response.raise_for_status()
+                response.raise_for_status()
                     
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                break
-                            try:
-                                data = json.loads(data_str)
-                                if "choices" in data and len(data["choices"]) > 0:
-                                    delta = data["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        yield delta["content"]
-                            except json.JSONDecodeError:
-                                continue
+                async for data_str in _iter_sse_data(response):
+                    text = _sse_delta_content(data_str)
+                    if text is not None:
+                        yield text
+                        continue
+                    # Fallback: role/finish chunks or unexpected shapes
+                    try:
+                        data = _json_loads(data_str)
+                        if "choices" in data and len(data["choices"]) > 0:
+                            delta = data["choices"][0].get("delta", {})
+                            if "content" in delta:
+                                yield delta["content"]
+                    except ValueError:
+                        continue
         except Exception as e:
             yield f"[Error: {str(e)}]"
     
@@ -255,10 +262,12 @@ class OpenRouterProvider(BaseAIProvider):
         
         try:
             url = f"{self.API_BASE}/auth/key"
-            headers = {"Authorization": f"Bearer {self.config.api_key}"}
-            
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, headers=headers)
+            client = self._http()
+            # Status-only probe: the body (e.g. the full model list) is
+            # never downloaded
+            async with client.stream(
+                "GET", url, headers=self._auth_headers, timeout=10
+            ) as response:
                 return response.status_code == 200
         except:
             return False
@@ -270,12 +279,10 @@ class OpenRouterProvider(BaseAIProvider):
         
         try:
             url = f"{self.API_BASE}/auth/key"
-            headers = {"Authorization": f"Bearer {self.config.api_key}"}
-            
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, headers=headers)
-                if response.status_code == 200:
-                    return response.json().get("data", {})
+            client = self._http()
+            response = await client.get(url, headers=self._auth_headers, timeout=10)
+            if response.status_code == 200:
+                return _json_loads(response.content).get("data", {})
         except:
             pass
         return None
@@ -16,9 +16,14 @@ def run_extension_service():
     sys.path.insert(0, current_dir)
     
     try:
-        # Import and run the extension service
+        # Import and run the extension service on a production WSGI server;
+        # the Werkzeug dev server stays as fallback if waitress is missing
         from extension_service import app
-        app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
+        try:
+            from waitress import serve
+            serve(app, host='0.0.0.0', port=5001, threads=8)
+        except ImportError:
+            app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
     except KeyboardInterrupt:
         print("\nExtension service stopped.")
     except Exception as e:
@@ -0,0 +1,39 @@
+"""Precompila modulele de prompt-uri pentru porniri rapide.
+
+config/prompts.py si config/extension_prompts.py sunt constante pure la
+import (fara I/O, fara pydantic), deci singurul cost ramas la un run scurt de
+CLI e parsarea sursei. Scriptul scrie bytecode-ul in __pycache__ inainte de
+build/packaging, astfel incat interpretul sa sara peste compilare la fiecare
+pornire.
+
+Usage: python tools/freeze_prompts.py
+"""
+import py_compile
+import sys
+from pathlib import Path
+
+PROMPT_MODULES = (
+    "config/prompts.py",
+    "config/extension_prompts.py",
+)
+
+
+def main() -> int:
+    root = Path(__file__).resolve().parent.parent
+    ok = True
+    for rel_path in PROMPT_MODULES:
+        source = root / rel_path
+        try:
+            # optimize=-1: nivelul interpretului curent, ca .pyc-ul scris sa
+            # fie exact cel pe care runtime-ul il cauta la pornire (optimize=2
+            # ar produce .opt-2.pyc, ignorat de o rulare normala)
+            compiled = py_compile.compile(str(source), doraise=True, optimize=-1)
+            print(f"{rel_path} -> {compiled}")
+        except py_compile.PyCompileError as e:
+            print(f"Eroare la compilarea {rel_path}: {e}")
+            ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
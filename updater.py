@@ -2,17 +2,100 @@
 import os
 import sys
 import json
+import http.client
+import threading
 import urllib.request
 import urllib.error
+import urllib.parse
 import hashlib
 import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# orjson daca e disponibil (decodeaza bytes direct, fara .decode()),
+# altfel stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configuratie GitHub
 GITHUB_REPO = "q30161834-beep/Aidala"
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 GITHUB_RAW_URL = f"https://raw.githubusercontent.com/{GITHUB_REPO}/main"
 
+# Conexiuni HTTPS keep-alive per thread si per host: un singur handshake
+# TCP+TLS catre api.github.com / raw.githubusercontent.com in loc de unul
+# pentru fiecare cerere
+_conn_local = threading.local()
+
+
+class _UrlopenResponse:
+    """Invelis subtire peste un raspuns urlopen fara .status utilizabil.
+
+    Pentru file:// (folosit in teste) addinfourl.status e o proprietate
+    read-only care intoarce None, deci nu poate fi nici citita util, nici
+    suprascrisa; invelisul expune un status explicit si deleaga restul
+    (.headers, .read()) raspunsului original.
+    """
+    __slots__ = ('_response', 'status')
+
+    def __init__(self, response, status):
+        self._response = response
+        self.status = status
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+def _pooled_urlopen(url, headers, timeout):
+    """GET care reutilizeaza conexiunea keep-alive a thread-ului curent.
+
+    Intoarce un raspuns cu .status, .headers si .read() (file-like), la fel
+    ca urlopen; apelantul verifica singur codul de status.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme == 'https':
+        conns = getattr(_conn_local, 'conns', None)
+        if conns is None:
+            conns = _conn_local.conns = {}
+        conn = conns.get(parts.netloc)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        for attempt in (0, 1):
+            if conn is None:
+                conn = http.client.HTTPSConnection(
+                    parts.hostname, parts.port, timeout=timeout)
+                conns[parts.netloc] = conn
+            try:
+                conn.request('GET', path, headers=headers)
+                return conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # Conexiune veche inchisa de server - reincearca o data
+                conn.close()
+                conns[parts.netloc] = conn = None
+                if attempt:
+                    raise
+    # Alte scheme (file:// in teste): urlopen clasic
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        # HTTPError e el insusi un raspuns complet (status, headers, corp);
+        # apelantii trateaza codurile de status, inclusiv 304
+        response = e
+    status = getattr(response, 'status', None)
+    if status is None:
+        response = _UrlopenResponse(response, getattr(response, 'code', None) or 200)
+    return response
+
+
+# Cat timp e valabil rezultatul unei verificari de update (GitHub API
+# anonim are cota de 60 cereri/ora - nu verificam la fiecare pornire)
+CHECK_CACHE_TTL = 6 * 3600
+
 # Fisierele care trebuie actualizate - se citesc din manifest.json de pe GitHub
 # Daca manifest.json nu exista, se foloseste lista default
 DEFAULT_UPDATE_FILES = [
@@ -34,87 +117,166 @@ class Updater:
     def __init__(self):
         self.base_path = self._get_base_path()
         self.version_file = Path(self.base_path) / "version.json"
-        self.current_version = self._get_current_version()
-        
+        # version.json tine versiunea plus ETag-urile fisierelor descarcate
+        self._version_data = self._load_version_data()
+        self.current_version = self._version_data.get('version', '1.0.0')
+        # Tuplul versiunii curente, parsat o singura data
+        self._current_tuple = self._version_tuple(self.current_version)
+
     def _get_base_path(self):
         """Obtine calea de baza"""
         if getattr(sys, 'frozen', False):
             return os.path.dirname(sys.executable)
         return os.path.dirname(os.path.abspath(__file__))
-    
-    def _get_current_version(self):
-        """Obtine versiunea curenta"""
+
+    def _load_version_data(self):
+        """Incarca datele din version.json (sau dict gol)"""
         if self.version_file.exists():
             try:
                 with open(self.version_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('version', '1.0.0')
+                    return json.load(f)
             except:
                 pass
-        return '1.0.0'
-    
+        return {}
+
     def _save_version(self, version):
-        """Salveaza versiunea"""
+        """Salveaza versiunea (pastrand ETag-urile)"""
+        self._version_data['version'] = version
         with open(self.version_file, 'w') as f:
-            json.dump({'version': version}, f)
+            json.dump(self._version_data, f)
+
+    @staticmethod
+    def _normalize_entry(entry):
+        """Accepta atat 'cale/fisier' cat si {'path': ..., 'sha256': ...}"""
+        if isinstance(entry, dict):
+            return entry.get('path', ''), entry.get('sha256')
+        return entry, None
+
+    @staticmethod
+    def _file_sha256(path):
+        """Hash-ul SHA-256 al unui fisier local (None daca nu exista)"""
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
     
+    def _store_check(self, result, etag):
+        """Retine rezultatul verificarii (si ETag-ul release-ului) pe disc"""
+        self._version_data['update_check'] = {
+            'checked_at': time.time(),
+            'result': result
+        }
+        if etag:
+            self._version_data['release_etag'] = etag
+        try:
+            with open(self.version_file, 'w') as f:
+                json.dump(self._version_data, f)
+        except OSError:
+            pass
+
     def check_for_update(self):
         """Verifica daca exista update disponibil"""
+        # Rezultat recent pe disc -> nu mai lovim GitHub API la pornire
+        cached = self._version_data.get('update_check')
+        if cached and time.time() - cached.get('checked_at', 0) < CHECK_CACHE_TTL:
+            return cached.get('result', {'available': False})
+
         try:
-            # Obtine ultima versiune de pe GitHub
-            req = urllib.request.Request(
-                GITHUB_API_URL,
-                headers={'User-Agent': 'CopySpell-AI-Updater'}
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                latest_version = data.get('tag_name', 'v1.0.0').lstrip('v')
-                
-                # Compara versiunile
-                if self._version_compare(latest_version, self.current_version) > 0:
-                    return {
-                        'available': True,
-                        'version': latest_version,
-                        'url': data.get('html_url', ''),
-                        'notes': data.get('body', 'No release notes')
-                    }
+            # Obtine ultima versiune de pe GitHub (conditionat de ETag)
+            headers = {'User-Agent': 'CopySpell-AI-Updater'}
+            etag = self._version_data.get('release_etag')
+            if etag and cached:
+                headers['If-None-Match'] = etag
+            response = _pooled_urlopen(GITHUB_API_URL, headers, 10)
+            body = response.read()
+            if response.status == 304:
+                # Release-ul nu s-a schimbat - doar reimprospatam cache-ul
+                result = cached.get('result', {'available': False})
+                self._store_check(result, etag)
+                return result
+            if response.status != 200:
+                raise RuntimeError(f"GitHub API: HTTP {response.status}")
+            data = _json_loads(body)
+            new_etag = response.headers.get('ETag')
+
+            latest_version = data.get('tag_name', 'v1.0.0').lstrip('v')
+
+            # Compara versiunile
+            result = {'available': False}
+            if self._version_tuple(latest_version) > self._current_tuple:
+                result = {
+                    'available': True,
+                    'version': latest_version,
+                    'url': data.get('html_url', ''),
+                    'notes': data.get('body', 'No release notes')
+                }
+            self._store_check(result, new_etag)
+            return result
         except Exception as e:
             print(f"Eroare la verificarea update-ului: {e}")
-        
+
         return {'available': False}
     
+    @staticmethod
+    def _version_tuple(v):
+        """Transforma '1.2.3' intr-un tuplu comparabil (fara zerouri finale)"""
+        try:
+            parts = tuple(int(x) for x in v.split('.'))
+        except ValueError:
+            return (0,)
+        while parts and parts[-1] == 0:
+            parts = parts[:-1]
+        return parts
+
     def _version_compare(self, v1, v2):
         """Compara doua versiuni"""
-        def normalize(v):
-            return [int(x) for x in v.split('.')]
-        
-        n1 = normalize(v1)
-        n2 = normalize(v2)
-        
-        for i in range(max(len(n1), len(n2))):
-            x1 = n1[i] if i < len(n1) else 0
-            x2 = n2[i] if i < len(n2) else 0
-            if x1 > x2:
-                return 1
-            elif x1 < x2:
-                return -1
-        return 0
+        n1 = self._version_tuple(v1)
+        n2 = self._version_tuple(v2)
+        return (n1 > n2) - (n1 < n2)
     
     def download_file(self, file_path, target_path):
-        """Descarca un fisier de pe GitHub"""
+        """Descarca un fisier de pe GitHub (conditionat de ETag)"""
         url = f"{GITHUB_RAW_URL}/{file_path}"
+        etags = self._version_data.setdefault('etags', {})
+        headers = {'User-Agent': 'CopySpell-AI-Updater'}
+        etag = etags.get(file_path)
+        if etag and os.path.exists(target_path):
+            headers['If-None-Match'] = etag
         try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'CopySpell-AI-Updater'})
-            with urllib.request.urlopen(req, timeout=30) as response:
-                content = response.read()
-                
             # Creeaza directorul daca nu exista
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            
-            # Salveaza fisierul
-            with open(target_path, 'wb') as f:
-                f.write(content)
-            
+            target_dir = os.path.dirname(target_path) or '.'
+            os.makedirs(target_dir, exist_ok=True)
+
+            response = _pooled_urlopen(url, headers, 30)
+            if response.status == 304:
+                # Fisierul local e identic cu cel de pe GitHub
+                response.read()  # goleste corpul ca sa pastram conexiunea
+                return True
+            if response.status != 200:
+                response.read()
+                raise RuntimeError(f"HTTP {response.status}")
+            new_etag = response.headers.get('ETag')
+            # Streaming in fisier temporar + os.replace: memoria ramane
+            # constanta (64 KiB) indiferent de marimea fisierului, iar o
+            # descarcare esuata nu corupe fisierul existent
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=target_dir, prefix='.update-')
+                with os.fdopen(fd, 'wb') as f:
+                    shutil.copyfileobj(response, f, length=64 * 1024)
+                os.replace(tmp_path, target_path)
+                tmp_path = None
+            finally:
+                if tmp_path:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+
+            if new_etag:
+                etags[file_path] = new_etag
             return True
         except Exception as e:
             print(f"Eroare la descarcarea {file_path}: {e}")
@@ -124,12 +286,15 @@ class Updater:
         """Obtine lista de fisiere de actualizat din manifest sau default"""
         try:
             url = f"{GITHUB_RAW_URL}/manifest.json"
-            req = urllib.request.Request(url, headers={'User-Agent': 'CopySpell-AI-Updater'})
-            with urllib.request.urlopen(req, timeout=10) as response:
-                manifest = json.loads(response.read().decode())
-                files = manifest.get('files', DEFAULT_UPDATE_FILES)
-                print(f"Manifest gasit: {len(files)} fisiere de actualizat")
-                return files
+            response = _pooled_urlopen(
+                url, {'User-Agent': 'CopySpell-AI-Updater'}, 10)
+            body = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"manifest.json: HTTP {response.status}")
+            manifest = _json_loads(body)
+            files = manifest.get('files', DEFAULT_UPDATE_FILES)
+            print(f"Manifest gasit: {len(files)} fisiere de actualizat")
+            return files
         except:
             print(f"Folosim lista default: {len(DEFAULT_UPDATE_FILES)} fisiere")
             return DEFAULT_UPDATE_FILES
@@ -144,17 +309,36 @@ class Updater:
         print("Se descarca fisierele...")
         success = True
         updated_files = []
-        
-        for file_path in update_files:
+
+        # Daca manifestul contine hash-uri, fisierele deja identice nu se
+        # mai descarca deloc
+        to_download = []
+        for entry in update_files:
+            file_path, expected_sha = self._normalize_entry(entry)
             target_path = os.path.join(self.base_path, file_path)
-            print(f"  Descarc {file_path}...", end=' ')
-            
-            if self.download_file(file_path, target_path):
-                print("OK")
+            if expected_sha and self._file_sha256(target_path) == expected_sha:
+                print(f"  {file_path}... deja la zi")
                 updated_files.append(file_path)
             else:
-                print("ESUAT")
-                success = False
+                to_download.append(file_path)
+
+        # Descarcari in paralel - fiecare fisier astepta inainte RTT+TLS pe
+        # rand, acum timpul total e aproximativ cat un singur fisier
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(
+                    self.download_file, f, os.path.join(self.base_path, f)
+                ): f
+                for f in to_download
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                if future.result():
+                    print(f"  {file_path}... OK")
+                    updated_files.append(file_path)
+                else:
+                    print(f"  {file_path}... ESUAT")
+                    success = False
         
         if success:
             self._save_version(new_version)
@@ -181,7 +365,23 @@ def check_and_update():
     if update_info['available']:
         print(f"\nUpdate disponibil: {update_info['version']}")
         print(f"Release notes: {update_info['notes'][:200]}...")
-        
+
+        # Fara terminal atasat (serviciu / launcher in fundal) nu blocam
+        # pornirea cu input(): actualizam doar daca e cerut explicit
+        try:
+            interactive = sys.stdin is not None and sys.stdin.isatty()
+        except (AttributeError, ValueError):
+            interactive = False
+        if not interactive:
+            if os.environ.get('AIDALA_AUTO_UPDATE') == '1':
+                if updater.update(update_info['version']):
+                    print("\nActualizare aplicata. Reporneste aplicatia "
+                          "pentru a folosi noua versiune.")
+            else:
+                print("Actualizare amanata (mod non-interactiv). "
+                      "Seteaza AIDALA_AUTO_UPDATE=1 pentru update automat.")
+            return
+
         response = input("\nDoresti sa actualizezi acum? (y/n): ").lower()
         if response in ['y', 'yes', 'da']:
             if updater.update(update_info['version']):
@@ -1,16 +1,31 @@
 """CopySpell AI - Web Version (Flask)"""
 import asyncio
+import threading
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, Response
+
+# orjson serializeaza mult mai repede decat json-ul stdlib folosit de
+# jsonify; daca lipseste, cadem inapoi pe stdlib
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
 from config.settings import settings
-from core.content_generator import ContentGenerator
+from core.content_generator import ContentGenerator, reset_status_cache
 from models import AUDIENCES, TONES, CONTENT_TYPES, FRAMEWORKS
 
 # Setează API keys implicite doar dacă nu rulează ca executabil sau dacă nu există .env
-import sys
 from pathlib import Path
 
 def load_local_dev_keys():
@@ -37,68 +52,171 @@ def load_local_dev_keys():
 load_local_dev_keys()
 
 app = Flask(__name__)
-generator = ContentGenerator()
 
-# Import and start auto updater
+# Continutul generat si istoricul sunt text de ordinul kilobytes - le
+# comprimam (brotli cu fallback gzip) daca flask-compress e instalat
 try:
-    from auto_updater import start_auto_update_checker
+    from flask_compress import Compress
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_MIN_SIZE"] = 512
+    app.config["COMPRESS_LEVEL"] = 5
+    Compress(app)
+except ImportError:
+    pass
+
+# Un singur event loop persistent, pe un thread de fundal: cererile nu mai
+# construiesc/inchid cate un loop fiecare, iar conexiunile HTTP keep-alive
+# ale providerilor se pastreaza intre cereri
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True, name="aio-loop").start()
+
+
+def _run_async(coro):
+    """Run a coroutine on the persistent background loop and wait for it."""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _json(obj, status=200):
+    """JSON response serialized with orjson instead of jsonify/stdlib json."""
+    return Response(_json_dumps(obj), status=status, mimetype="application/json")
+
+
+@app.before_request
+def _fresh_status_snapshot():
+    # Memo-ul de status al providerilor e per-request; pe un server threaded
+    # ContextVar-ul traieste cat thread-ul de worker, deci il golim la
+    # inceputul fiecarei cereri ca sa nu servim un snapshot vechi
+    reset_status_cache()
+
+
+@app.after_request
+def _no_store_generated(response):
+    # Continutul generat e per-utilizator: intermediarii nu au voie sa-l cacheze
+    if request.path == "/api/generate":
+        response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+generator = ContentGenerator()
+
+# Auto-updater-ul porneste pe un thread de fundal ca importul modulului
+# (si deci pornirea serverului) sa nu astepte dupa I/O-ul lui de retea
+AUTO_UPDATER_AVAILABLE = False
+
+
+def _start_auto_updater():
+    global AUTO_UPDATER_AVAILABLE
+    try:
+        from auto_updater import start_auto_update_checker
+    except ImportError:
+        print("Auto updater not available")
+        return
     AUTO_UPDATER_AVAILABLE = True
     start_auto_update_checker()
     print("Auto update checker started (checks every 10 minutes)")
-except ImportError:
-    AUTO_UPDATER_AVAILABLE = False
-    print("Auto updater not available")
+
+
+threading.Thread(target=_start_auto_updater, daemon=True).start()
+
+
+# Providerii suportati, in ordinea afisarii; config GET/POST si lista de
+# optiuni itereaza acest tuplu in loc sa-si repete fiecare numele
+_PROVIDERS = ("deepseek", "groq", "openrouter")
+
+# Listele de optiuni sunt statice pe durata procesului - le construim o
+# singura data la import in loc sa refacem dict-urile la fiecare request
+_OPTIONS = {
+    "audiences": [{"id": a.id, "name": a.name} for a in AUDIENCES],
+    "tones": [{"id": t.id, "name": t.name} for t in TONES],
+    "content_types": [{"id": ct.id, "name": ct.name} for ct in CONTENT_TYPES],
+    "frameworks": list(FRAMEWORKS.keys()),
+    "providers": list(_PROVIDERS)
+}
 
 
 def get_options():
     """Get all options for the form."""
-    return {
-        "audiences": [{"id": a.id, "name": a.name} for a in AUDIENCES],
-        "tones": [{"id": t.id, "name": t.name} for t in TONES],
-        "content_types": [{"id": ct.id, "name": ct.name} for ct in CONTENT_TYPES],
-        "frameworks": list(FRAMEWORKS.keys()),
-        "providers": ["deepseek", "groq", "openrouter"]
-    }
+    return _OPTIONS
+
+
+# HTML-ul paginii principale depinde doar de has_keys, deci il randam o
+# singura data per valoare si servim string-ul gata facut; invalidat la
+# POST /api/config cand se schimba cheile
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+_INDEX_CACHE: dict = {}
 
 
 @app.route("/")
 def index():
     """Main page."""
-    options = get_options()
     has_keys = settings.has_any_api_key()
-    return render_template("index.html", options=options, has_keys=has_keys)
+    html = _INDEX_CACHE.get(has_keys)
+    if html is None:
+        html = render_template("index.html", options=get_options(), has_keys=has_keys)
+        _INDEX_CACHE[has_keys] = html
+    return html
+
+
+# Campurile acceptate de /api/generate: valorile implicite plus maparea
+# nume-din-payload -> nume-de-argument; payload-ul se parcurge o singura
+# data in loc de 12 data.get() separate, iar campurile necunoscute se ignora
+_GENERATE_DEFAULTS = {
+    "keywords": "",
+    "content_type_id": "facebook_post",
+    "framework": "AIDA",
+    "audience_id": "weight_loss_seeker",
+    "tone_id": "empathetic",
+    "additional_context": "",
+    "preferred_provider": None,
+    "word_count": "normal",
+    "custom_audience": None,
+    "custom_tone": None,
+    "custom_content_type": None,
+    "custom_framework": None,
+}
+_GENERATE_KEY_MAP = {
+    "keywords": "keywords",
+    "content_type": "content_type_id",
+    "framework": "framework",
+    "audience": "audience_id",
+    "tone": "tone_id",
+    "additional_context": "additional_context",
+    "provider": "preferred_provider",
+    "word_count": "word_count",
+    "custom_audience": "custom_audience",
+    "custom_tone": "custom_tone",
+    "custom_content_type": "custom_content_type",
+    "custom_framework": "custom_framework",
+}
 
 
 @app.route("/api/generate", methods=["POST"])
 def generate():
     """Generate content endpoint."""
+    # Respingem cererile invalide inainte sa platim parsarea body-ului
     if not settings.has_any_api_key():
-        return jsonify({"error": "No API keys configured"}), 400
-    
-    data = request.json
+        return _json({"error": "No API keys configured"}, 400)
+    if request.mimetype != "application/json":
+        return _json({"error": "Expected application/json"}, 415)
+
+    try:
+        # cache=False: nu pastram o copie a body-ului pe obiectul request
+        data = _json_loads(request.get_data(cache=False)) or {}
+    except ValueError:
+        return _json({"error": "Invalid JSON body"}, 400)
     
+    kwargs = _GENERATE_DEFAULTS.copy()
+    for key, value in data.items():
+        arg = _GENERATE_KEY_MAP.get(key)
+        if arg is not None and value is not None and value != "":
+            kwargs[arg] = value
+
     try:
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(generator.generate(
-            keywords=data.get("keywords", ""),
-            content_type_id=data.get("content_type", "facebook_post"),
-            framework=data.get("framework", "AIDA"),
-            audience_id=data.get("audience", "weight_loss_seeker"),
-            tone_id=data.get("tone", "empathetic"),
-            additional_context=data.get("additional_context", ""),
-            preferred_provider=data.get("provider") or None,
-            word_count=data.get("word_count", "normal"),
-            custom_audience=data.get("custom_audience"),
-            custom_tone=data.get("custom_tone"),
-            custom_content_type=data.get("custom_content_type"),
-            custom_framework=data.get("custom_framework")
-        ))
-        loop.close()
-        
+        # Dispatch to the persistent background loop
+        result = _run_async(generator.generate(**kwargs))
+
         if result.success:
-            return jsonify({
+            return _json({
                 "success": True,
                 "content": result.content,
                 "provider": result.provider_used,
@@ -106,46 +224,77 @@ def generate():
                 "tokens": result.tokens_used
             })
         else:
-            return jsonify({
+            return _json({
                 "success": False,
                 "error": "\n".join(result.errors) if result.errors else "Unknown error"
-            }), 500
-            
+            }, 500)
+
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}, 500)
+
+
+@app.route("/api/cache/stats")
+def cache_stats():
+    """Response cache hit/miss counters."""
+    return _json(generator.cache_stats())
 
 
 @app.route("/api/history")
 def get_history():
-    """Get generation history."""
-    return jsonify(generator.get_history())
+    """Get generation history (bounded via ?limit=N, streamed per item)."""
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+    entries = generator.get_history(limit)
+
+    def stream():
+        yield b"["
+        for i, item in enumerate(entries):
+            if i:
+                yield b","
+            yield _json_dumps(item)
+        yield b"]"
+
+    return Response(stream(), mimetype="application/json")
 
 
 @app.route("/api/config", methods=["GET", "POST"])
 def config():
     """Get or save API configuration."""
     if request.method == "GET":
-        return jsonify({
-            "deepseek": bool(settings.deepseek_api_key),
-            "groq": bool(settings.groq_api_key),
-            "openrouter": bool(settings.openrouter_api_key)
+        return _json({
+            p: bool(getattr(settings, f"{p}_api_key")) for p in _PROVIDERS
         })
-    
+
     elif request.method == "POST":
-        data = request.json
-        settings.deepseek_api_key = data.get("deepseek", "").strip() or None
-        settings.groq_api_key = data.get("groq", "").strip() or None
-        settings.openrouter_api_key = data.get("openrouter", "").strip() or None
+        try:
+            data = _json_loads(request.get_data(cache=False)) or {}
+        except ValueError:
+            return _json({"error": "Invalid JSON body"}, 400)
+        for p in _PROVIDERS:
+            setattr(settings, f"{p}_api_key", (data.get(p) or "").strip() or None)
         settings.save_api_keys()
         
-        # Reinitialize generator
-        global generator
-        generator = ContentGenerator()
-        
-        return jsonify({"success": True})
+        # Rotim cheile in loc sa reconstruim generatorul: sesiunea HTTP,
+        # cache-ul de raspunsuri si istoricul raman calde; reincalzim
+        # conexiunile pe loop-ul de fundal fara sa blocam POST-ul
+        generator.update_api_keys()
+        asyncio.run_coroutine_threadsafe(generator.router.warm_up(), _loop)
+
+        # Pagina principala depinde de has_keys - fortam o re-randare
+        _INDEX_CACHE.clear()
+
+        return _json({"success": True})
 
 
 if __name__ == "__main__":
     print(f"Starting {settings.app_name}...")
     print(f"Open browser at: http://localhost:5000")
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Acelasi server de productie ca in launcher; dev-serverul Werkzeug
+    # ramane fallback daca waitress lipseste
+    try:
+        from waitress import serve
+        serve(app, host="127.0.0.1", port=5000, threads=16)
+    except ImportError:
+        app.run(host="127.0.0.1", port=5000, debug=False, threaded=True)
\ No newline at end of file